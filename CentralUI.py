@@ -1,26 +1,381 @@
 import sys
 import os
-import requests
 import zipfile
 import tempfile
 import subprocess
 import json
+import time
+from bisect import bisect_left
+from collections import deque
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QMessageBox, QFileDialog, QVBoxLayout,
-    QWidget, QPushButton, QLabel, QListWidget, QComboBox, QLineEdit, QDialog, QHBoxLayout
+    QWidget, QPushButton, QLabel, QListWidget, QListView, QComboBox, QLineEdit, QDialog, QHBoxLayout, QPlainTextEdit
 )
-from PySide6.QtCore import Qt, QUrl, QSize
-from PySide6.QtGui import QIcon, QDesktopServices
+from PySide6.QtCore import (
+    Qt, QUrl, QSize, QObject, QRunnable, QThreadPool, Signal, QProcess, QAbstractListModel, QModelIndex,
+    QFileSystemWatcher, QTimer
+)
+from PySide6.QtGui import QIcon, QDesktopServices, QTextCursor
+
+from Updater.FileLocator import locate
+from Updater.PackageInstaller import install_packages, load_requirements
+from Updater.ReleaseMetadata import get_latest_release_tag
+
+# Kept in the extracted folder, records which zip members are already there
+EXTRACT_MANIFEST_NAME = ".extract_manifest.json"
+
+# Runs utilities inside an interpreter that was started, and had numpy, cv2 and psutil imported, before it was needed
+LAUNCHER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ScriptLauncher.py")
+
+# How many warmed launchers to keep waiting, so runs straight after each other are warm too
+WARM_POOL_SIZE = 2
+
+# How long the release zip has to stay unchanged before it is read again, so a half written zip isn't read
+RELOAD_DELAY_MS = 500
+
+
+def zip_manifest(zip_ref):
+    # Size and CRC come straight from the zip's central directory, so nothing has to be decompressed
+    return {info.filename: [info.file_size, info.CRC] for info in zip_ref.infolist() if not info.is_dir()}
+
+
+def load_extract_manifest(extracted_folder_path):
+    try:
+        with open(os.path.join(extracted_folder_path, EXTRACT_MANIFEST_NAME), "r") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_extract_manifest(extracted_folder_path, manifest):
+    manifest_path = os.path.join(extracted_folder_path, EXTRACT_MANIFEST_NAME)
+    # Written to a temporary file first so a crash can't leave a half written manifest behind
+    with open(manifest_path + ".tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def is_extracted(manifest, extracted_folder_path, name, entry):
+    target_path = os.path.join(extracted_folder_path, name)
+    # The size check catches files that were deleted or edited after they were extracted
+    return manifest.get(name) == entry and os.path.isfile(target_path) and os.path.getsize(target_path) == entry[0]
+
+
+class ZipRelease:
+    """
+    Browses a release zip through its central directory without extracting it. Files are only
+    extracted, together with the other files in their folder so their imports and data files
+    work, when they are needed on disk.
+    """
+
+    def __init__(self, zip_file_path, extracted_folder_path):
+        self.zip_file_path = zip_file_path
+        self.extracted_folder_path = extracted_folder_path
+        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+            self.manifest = zip_manifest(zip_ref)
+        self._extracted = None
+
+        # Folders and files in zips always use forward slashes
+        self.folders = sorted({name.split("/", 1)[0] for name in self.manifest if "/" in name})
+
+    def files(self, folder):
+        prefix = folder + "/"
+        return sorted(name for name in self.manifest if name.startswith(prefix))
 
+    def local_path(self, name):
+        return os.path.join(self.extracted_folder_path, *name.split("/"))
 
-def install_packages(packages):
-    for package in packages:
+    def extract(self, name):
+        """
+        Makes sure a file and the rest of its folder are extracted and up to date.
+
+        Returns:
+        str: Where the file is on disk.
+        """
+        if self._extracted is None:
+            self._extracted = load_extract_manifest(self.extracted_folder_path)
+
+        folder = name.rpartition("/")[0]
+        prefix = folder + "/" if folder else ""
+        needed = [
+            member for member, entry in self.manifest.items()
+            if member.startswith(prefix) and "/" not in member[len(prefix):]
+            and not is_extracted(self._extracted, self.extracted_folder_path, member, entry)
+        ]
+        if needed:
+            with zipfile.ZipFile(self.zip_file_path, 'r') as zip_ref:
+                for member in needed:
+                    zip_ref.extract(member, self.extracted_folder_path)
+                    self._extracted[member] = self.manifest[member]
+            save_extract_manifest(self.extracted_folder_path, self._extracted)
+        return self.local_path(name)
+
+
+class ReleaseFileModel(QAbstractListModel):
+    """
+    The files of a release, for a QListView. The sorted names and their lower case search keys
+    are built once, selecting a folder or typing a search only filters them in memory, and when
+    the release changes only the rows that were added or removed are updated.
+
+    With a folder selected the files in it are shown, narrowed down by the search text. With no
+    folder selected the search text is matched against every file in the release.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._keys = []
+        self._hidden = set()
+        self._folder = None
+        self._text = ""
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._rows[index.row()]
+        return None
+
+    def name(self, index):
+        return self._rows[index.row()] if index.isValid() and index.row() < len(self._rows) else None
+
+    def _matches(self, name):
+        if name in self._hidden:
+            return False
+        if self._folder is None:
+            return bool(self._text) and self._text in name.lower()
+        return name.startswith(self._folder + "/") and self._text in name.lower()
+
+    def _refilter(self):
+        names, keys = self._names, self._keys
+        if self._folder is not None:
+            # The names are sorted, so a folder's files are the slice between "folder/" and "folder0"
+            low = bisect_left(names, self._folder + "/")
+            high = bisect_left(names, self._folder + "0")
+            names, keys = names[low:high], keys[low:high]
+        elif not self._text:
+            names, keys = [], []
+        rows = [name for name, key in zip(names, keys) if self._text in key] if self._text else list(names)
+        if self._hidden:
+            rows = [name for name in rows if name not in self._hidden]
+
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def set_files(self, names, hidden=()):
+        self._names = sorted(names)
+        self._keys = [name.lower() for name in self._names]
+        self._hidden = set(hidden)
+        self._refilter()
+
+    def set_folder(self, folder):
+        self._folder = folder
+        self._refilter()
+
+    def set_search(self, text):
+        self._text = text.strip().lower()
+        self._refilter()
+
+    def _remove_row(self, name):
+        row = bisect_left(self._rows, name)
+        if row < len(self._rows) and self._rows[row] == name:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
+    def update_files(self, names):
+        """
+        Brings the list up to date with a new set of file names, inserting and removing only the
+        rows that changed so the selection and scroll position are kept.
+
+        Returns:
+        tuple: How many files were added and removed.
+        """
+        names = set(names)
+        old_names = set(self._names)
+        added = sorted(names - old_names)
+        removed = sorted(old_names - names)
+
+        for name in removed:
+            position = bisect_left(self._names, name)
+            del self._names[position]
+            del self._keys[position]
+            self._remove_row(name)
+        for name in added:
+            position = bisect_left(self._names, name)
+            self._names.insert(position, name)
+            self._keys.insert(position, name.lower())
+            if self._matches(name):
+                row = bisect_left(self._rows, name)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, name)
+                self.endInsertRows()
+        return len(added), len(removed)
+
+    def hide(self, name):
+        self._hidden.add(name)
+        self._remove_row(name)
+
+
+class WorkerSignals(QObject):
+    finished = Signal(object)
+    error = Signal(str)
+    progress = Signal(str)
+
+
+class Worker(QRunnable):
+    """
+    Runs a function on the thread pool so slow network and disk work doesn't freeze the window.
+    The result, or the error message, is delivered back on the GUI thread through signals.
+    With with_progress the function is also given a callback that sends progress messages.
+    """
+
+    def __init__(self, func, *args, with_progress=False):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = WorkerSignals()
+        if with_progress:
+            self.args += (self.signals.progress.emit,)
+
+    def run(self):
         try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'show', package])
-            print(f"{package} is already installed.")
-        except subprocess.CalledProcessError:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class ScriptConsole(QWidget):
+    """
+    Runs a utility with QProcess and shows its output in the window. Whatever is typed into the
+    input box is sent to the utility, so scripts that ask questions with input() still work.
+
+    A small pool of launcher interpreters is kept started and waiting with the heavy modules
+    already imported, so a run only has to tell one which script to run instead of paying for
+    Python's startup and those imports. If none is ready the script is started the ordinary way.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setMaximumBlockCount(5000)  # Keep chatty scripts from using up memory
+        layout.addWidget(self.output)
+
+        input_layout = QHBoxLayout()
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Type input for the running script and press Enter")
+        self.input.returnPressed.connect(self.send_input)
+        input_layout.addWidget(self.input)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.clicked.connect(self.stop)
+        self.stop_button.setEnabled(False)
+        input_layout.addWidget(self.stop_button)
+        layout.addLayout(input_layout)
+        self.setLayout(layout)
+
+        self.process = None
+        self.spares = deque()
+        self.fill_pool()
+
+    def fill_pool(self):
+        # Launchers that died, say because they were killed from outside, are dropped and replaced
+        for spare in [spare for spare in self.spares if spare.state() == QProcess.NotRunning]:
+            self.spares.remove(spare)
+            spare.deleteLater()
+        while len(self.spares) < WARM_POOL_SIZE:
+            spare = QProcess(self)
+            spare.setProcessChannelMode(QProcess.MergedChannels)
+            spare.start(sys.executable, ["-u", LAUNCHER_PATH])
+            self.spares.append(spare)
+
+    def take_spare(self):
+        while self.spares:
+            spare = self.spares.popleft()
+            if spare.state() == QProcess.Starting:
+                spare.waitForStarted(1000)
+            if spare.state() == QProcess.Running:
+                return spare
+            spare.deleteLater()
+        return None
+
+    def run(self, script_path):
+        self.stop()
+        self.output.setPlainText(f"> python {os.path.basename(script_path)}\n")
+
+        process = self.take_spare()
+        if process is not None:
+            process.write((json.dumps({"script": script_path}) + "\n").encode())
+        else:
+            process = QProcess(self)
+            process.setProcessChannelMode(QProcess.MergedChannels)
+            process.setWorkingDirectory(os.path.dirname(script_path))
+            process.start(sys.executable, ["-u", script_path])
+        process.readyReadStandardOutput.connect(lambda: self.read_output(process))
+        process.finished.connect(lambda exit_code, _: self.on_finished(process, exit_code))
+        self.process = process
+        self.stop_button.setEnabled(True)
+        self.input.setFocus()
+
+        # Get the next one ready while this one runs
+        self.fill_pool()
+
+    def read_output(self, process):
+        text = bytes(process.readAllStandardOutput()).decode(errors="replace")
+        self.output.moveCursor(QTextCursor.End)
+        self.output.insertPlainText(text)
+        self.output.ensureCursorVisible()
+
+    def on_finished(self, process, exit_code):
+        if process is not self.process:
+            return
+        self.read_output(process)
+        self.output.appendPlainText(f"[Finished with exit code {exit_code}]")
+        self.stop_button.setEnabled(False)
+        self.release(process)
+
+    def release(self, process):
+        # Frees a finished run's QProcess, and its connections along with it, once control is back in the event loop
+        if process is self.process:
+            self.process = None
+        process.deleteLater()
+
+    def send_input(self):
+        if self.process is None or self.process.state() != QProcess.Running:
+            return
+        text = self.input.text()
+        self.input.clear()
+        self.output.moveCursor(QTextCursor.End)
+        self.output.insertPlainText(text + "\n")
+        self.process.write((text + "\n").encode())
+
+    def stop(self):
+        process = self.process
+        if process is not None:
+            if process.state() != QProcess.NotRunning:
+                process.kill()
+                process.waitForFinished(1000)
+            # on_finished has normally released it by now, unless it never reported finishing
+            if process is self.process:
+                self.release(process)
+        self.stop_button.setEnabled(False)
+
+    def shutdown(self):
+        self.stop()
+        for spare in self.spares:
+            spare.kill()
+            spare.waitForFinished(1000)
+        self.spares.clear()
 
 
 class SettingsDialog(QDialog):
@@ -71,43 +426,142 @@ class SettingsDialog(QDialog):
 
 
 class FileExecutorApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_time=None):
         super().__init__()
+        # Used to log how long startup takes, from the moment the app was launched
+        self.startup_time = startup_time or time.perf_counter()
+        self.first_paint_logged = False
         self.default_config = {
             "color_scheme": "dark",
             "default_download_path": "~/Downloads",
             "default_extracted_path": "/tmp",
-            "window_geometry": "800x600"
+            "window_geometry": "800x600",
+            "hidden_files": []
         }
-
-        self.latest_release_name = self.get_latest_release_name()
+        self.config = dict(self.default_config)
+        self.release = None
+
+        # Reads the release again when the zip is replaced, once it has stopped changing
+        self.release_watcher = QFileSystemWatcher(self)
+        self.release_watcher.fileChanged.connect(self.on_release_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload_release)
+        self.discord_logo_path = None
+
+        # Show the window straight away and fill it in as the background work finishes
+        self.init_ui()
+        self.thread_pool = QThreadPool(self)
+        # The work is mostly waiting on the network and the disk, so don't limit it to one thread per core
+        self.thread_pool.setMaxThreadCount(max(4, QThreadPool.globalInstance().maxThreadCount()))
+        self.workers = set()
+        self.run_in_background(self.get_latest_release_name, self.on_release_name)
+        # Search for discord_logo.png in Downloads directory
+        self.run_in_background(self.find_discord_logo, self.on_discord_logo)
+
+    def run_in_background(self, func, on_finished, *args, on_error=None, on_progress=None):
+        worker = Worker(func, *args, with_progress=on_progress is not None)
+        worker.signals.finished.connect(on_finished)
+        worker.signals.error.connect(on_error or self.on_background_error)
+        if on_progress is not None:
+            worker.signals.progress.connect(on_progress)
+        # Hold on to the worker until it reports back, otherwise Python can free its signals while it runs
+        self.workers.add(worker)
+        worker.signals.finished.connect(lambda _: self.workers.discard(worker))
+        worker.signals.error.connect(lambda _: self.workers.discard(worker))
+        self.thread_pool.start(worker)
+
+    def log_startup(self, stage):
+        print(f"Startup: {stage} after {(time.perf_counter() - self.startup_time) * 1000:.0f} ms")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_logged:
+            self.first_paint_logged = True
+            self.log_startup("first paint")
+
+    def fail(self, message):
+        QMessageBox.critical(self, "Error", message)
+        self.close()
+        QApplication.instance().exit(1)
+
+    def on_background_error(self, message):
+        self.fail(f"Startup failed: {message}")
+
+    def on_release_name(self, latest_release_name):
+        self.log_startup("release name fetched")
+        self.latest_release_name = latest_release_name
         if not self.latest_release_name:
-            QMessageBox.critical(self, "Error", "Could not fetch the latest release name.")
-            sys.exit(1)
+            self.fail("Could not fetch the latest release name.")
+            return
 
         self.zip_file_path = os.path.join(os.path.expanduser('~'), 'Downloads', f'Python-Utilities-{self.latest_release_name}.zip')
         if not os.path.exists(self.zip_file_path):
-            QMessageBox.critical(self, "Error", f"The file '{self.zip_file_path}' does not exist.")
-            sys.exit(1)
+            self.fail(f"The file '{self.zip_file_path}' does not exist.")
+            return
 
         self.extracted_folder_path = os.path.join(tempfile.gettempdir(), f'Python-Utilities-{self.latest_release_name}')
-        self.extract_zip_file()
+        os.makedirs(self.extracted_folder_path, exist_ok=True)
 
         self.config_file_path = os.path.join(self.extracted_folder_path, "config.json")
         self.create_config_if_not_exists()
-        self.load_config()
+        if not self.load_config():
+            return
+        self.resize(*map(int, self.config["window_geometry"].split("x")))
 
-        # Search for discord_logo.png in Downloads directory
-        self.discord_logo_path = self.find_discord_logo()
+        # Only the zip's index is read, scripts are extracted when they are opened
+        self.run_in_background(ZipRelease, self.on_release_loaded, self.zip_file_path, self.extracted_folder_path)
 
-        self.init_ui()
+    def on_release_loaded(self, release):
+        self.release = release
+        self.loading_label.hide()
+        self.folder_list.setEnabled(True)
+        self.search_edit.setEnabled(True)
+        self.settings_button.setEnabled(True)
+        self.update_folder_list()
+        self.file_model.set_files(release.manifest, self.config.get("hidden_files", []))
+        self.release_watcher.addPath(self.zip_file_path)
+        self.log_startup("folders listed")
+
+    def on_release_changed(self, path):
+        # Restart the wait on every change, a download writes to the zip many times
+        self.reload_timer.start()
+
+    def reload_release(self):
+        if not os.path.exists(self.zip_file_path):
+            self.statusBar().showMessage(f"'{self.zip_file_path}' was removed, showing the files it had.")
+            return
+        # Replacing the file, as the updater does, ends the watch on the old one
+        if self.zip_file_path not in self.release_watcher.files():
+            self.release_watcher.addPath(self.zip_file_path)
+        self.run_in_background(ZipRelease, self.on_release_reloaded, self.zip_file_path, self.extracted_folder_path,
+                               on_error=self.on_reload_failed)
+
+    def on_release_reloaded(self, release):
+        self.release = release
+        self.update_folder_list()
+        added, removed = self.file_model.update_files(release.manifest)
+        if added or removed:
+            self.statusBar().showMessage(f"Release updated: {added} files added, {removed} removed.", 5000)
+
+    def on_reload_failed(self, message):
+        # Most likely caught part way through being written, the next change reads it again
+        self.statusBar().showMessage(f"Could not read the updated release: {message}")
+
+    def on_discord_logo(self, discord_logo_path):
+        self.discord_logo_path = discord_logo_path
+        self.log_startup("Discord logo search finished")
+        if discord_logo_path:
+            self.discord_button.setText("")
+            self.discord_button.setIcon(QIcon(discord_logo_path))
+            self.discord_button.setMaximumSize(self.discord_button.sizeHint())
 
     def find_discord_logo(self):
         downloads_dir = os.path.expanduser("~/Downloads")
-        for root, _, files in os.walk(downloads_dir):
-            if "discord_logo.png" in files:
-                return os.path.join(root, "discord_logo.png")
-        return None
+        # Look where the logo ships in the repository first, then search Downloads a limited number of folders deep
+        logo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Images-Release", "New")
+        return locate("discord_logo.png", [downloads_dir], likely_dirs=[logo_dir])
 
     def init_ui(self):
         self.setWindowTitle("Python Utilities Executor")
@@ -118,38 +572,54 @@ class FileExecutorApp(QMainWindow):
 
         # Top Layout for Discord Button
         top_layout = QHBoxLayout()
-        discord_button = QPushButton()
-        if self.discord_logo_path:
-            discord_button.setIcon(QIcon(self.discord_logo_path))
-        else:
-            discord_button.setText("Discord")  # Fallback text if icon is not found
-        discord_button.setIconSize(QSize(24, 24))
-        discord_button.setToolTip("Join our Discord Server")
-        discord_button.clicked.connect(self.open_discord_server)
-        discord_button.setMaximumSize(discord_button.sizeHint())  # Make the button as small as needed
-        top_layout.addWidget(discord_button, alignment=Qt.AlignLeft)
+        self.discord_button = QPushButton()
+        self.discord_button.setText("Discord")  # Fallback text until the icon is found, if it ever is
+        self.discord_button.setIconSize(QSize(24, 24))
+        self.discord_button.setToolTip("Join our Discord Server")
+        self.discord_button.clicked.connect(self.open_discord_server)
+        self.discord_button.setMaximumSize(self.discord_button.sizeHint())  # Make the button as small as needed
+        top_layout.addWidget(self.discord_button, alignment=Qt.AlignLeft)
         top_layout.addStretch()  # Push everything else to the right
 
         main_layout.addLayout(top_layout)
 
         # Folder Selector
         main_layout.addWidget(QLabel("Select a folder containing Python utilities"))
+        self.loading_label = QLabel("Loading the latest release...")
+        main_layout.addWidget(self.loading_label)
         self.folder_list = QListWidget()
         self.folder_list.itemSelectionChanged.connect(self.on_folder_select)
+        self.folder_list.setEnabled(False)
         main_layout.addWidget(self.folder_list)
 
         # File Selector
         main_layout.addWidget(QLabel("Select a file to execute"))
-        self.file_list = QListWidget()
-        self.file_list.itemSelectionChanged.connect(self.update_buttons_state)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search, or pick a folder to search only in it")
+        self.search_edit.textChanged.connect(self.on_search_changed)
+        self.search_edit.setEnabled(False)
+        main_layout.addWidget(self.search_edit)
+        self.file_model = ReleaseFileModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setUniformItemSizes(True)  # Lets the view skip measuring every row of a long list
+        self.file_list.selectionModel().currentChanged.connect(self.update_buttons_state)
+        self.file_model.modelReset.connect(self.update_buttons_state)
         main_layout.addWidget(self.file_list)
 
         # Buttons
-        self.execute_button = QPushButton("Open in CMD")
-        self.execute_button.clicked.connect(self.open_in_cmd)
+        self.execute_button = QPushButton("Run")
+        self.execute_button.clicked.connect(self.run_script)
         self.execute_button.setEnabled(False)
         main_layout.addWidget(self.execute_button)
 
+        # A separate console window is only available on Windows
+        self.cmd_button = QPushButton("Open in CMD")
+        self.cmd_button.clicked.connect(self.open_in_cmd)
+        self.cmd_button.setEnabled(False)
+        self.cmd_button.setVisible(sys.platform == "win32")
+        main_layout.addWidget(self.cmd_button)
+
         self.open_location_button = QPushButton("Open in File Location")
         self.open_location_button.clicked.connect(self.open_in_file_location)
         self.open_location_button.setEnabled(False)
@@ -160,28 +630,26 @@ class FileExecutorApp(QMainWindow):
         self.delete_button.setEnabled(False)
         main_layout.addWidget(self.delete_button)
 
-        install_button = QPushButton("Install Packages")
-        install_button.clicked.connect(self.install_required_packages)
-        main_layout.addWidget(install_button)
+        self.install_button = QPushButton("Install Packages")
+        self.install_button.clicked.connect(self.install_required_packages)
+        main_layout.addWidget(self.install_button)
+
+        # The settings live next to the extracted release, so they can't be changed until it has loaded
+        self.settings_button = QPushButton("Settings")
+        self.settings_button.clicked.connect(self.open_settings)
+        self.settings_button.setEnabled(False)
+        main_layout.addWidget(self.settings_button)
 
-        settings_button = QPushButton("Settings")
-        settings_button.clicked.connect(self.open_settings)
-        main_layout.addWidget(settings_button)
+        # Output of the running script
+        self.console = ScriptConsole()
+        main_layout.addWidget(self.console)
 
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
-        self.update_folder_list()
-
     def get_latest_release_name(self):
-        try:
-            response = requests.get("https://api.github.com/repos/Stari-Div/Python-Utilities/releases/latest")
-            response.raise_for_status()
-            latest_release = response.json()
-            return latest_release['tag_name']
-        except requests.RequestException as e:
-            print(f"Error fetching latest release: {e}")
-            return None
+        # Cached on disk and shared with the updater, falls back to the last known tag when offline
+        return get_latest_release_tag()
 
     def create_config_if_not_exists(self):
         if not os.path.exists(self.config_file_path):
@@ -202,8 +670,9 @@ class FileExecutorApp(QMainWindow):
             with open(self.config_file_path, "r") as config_file:
                 self.config = json.load(config_file)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not load configuration file: {e}")
-            sys.exit(1)
+            self.fail(f"Could not load configuration file: {e}")
+            return False
+        return True
 
     def save_config(self, config):
         try:
@@ -213,39 +682,53 @@ class FileExecutorApp(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not save configuration file: {e}")
 
-    def extract_zip_file(self):
-        if not os.path.exists(self.extracted_folder_path):
-            os.makedirs(self.extracted_folder_path)
-        with zipfile.ZipFile(self.zip_file_path, 'r') as zip_ref:
-            zip_ref.extractall(self.extracted_folder_path)
-
     def update_folder_list(self):
-        self.folder_list.clear()
-        for item in os.listdir(self.extracted_folder_path):
-            item_path = os.path.join(self.extracted_folder_path, item)
-            if os.path.isdir(item_path):
-                self.folder_list.addItem(item)
+        # Only add and remove the folders that changed, so the selected one stays selected
+        shown = [self.folder_list.item(row).text() for row in range(self.folder_list.count())]
+        if shown == self.release.folders:
+            return
+        for row in reversed(range(len(shown))):
+            if shown[row] not in self.release.folders:
+                self.folder_list.takeItem(row)
+        shown = [self.folder_list.item(row).text() for row in range(self.folder_list.count())]
+        for row, folder in enumerate(self.release.folders):
+            if folder not in shown:
+                self.folder_list.insertItem(row, folder)
 
     def on_folder_select(self):
-        self.file_list.clear()
         selected_folder = self.folder_list.currentItem()
-        if selected_folder:
-            folder_path = os.path.join(self.extracted_folder_path, selected_folder.text())
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    self.file_list.addItem(os.path.join(root, file))
-        self.update_buttons_state()
+        self.file_model.set_folder(selected_folder.text() if selected_folder else None)
+
+    def on_search_changed(self, text):
+        self.file_model.set_search(text)
+
+    def selected_file(self):
+        return self.file_model.name(self.file_list.currentIndex())
 
     def update_buttons_state(self):
-        has_selection = self.file_list.currentItem() is not None
+        has_selection = self.selected_file() is not None
         self.execute_button.setEnabled(has_selection)
+        self.cmd_button.setEnabled(has_selection)
         self.open_location_button.setEnabled(has_selection)
         self.delete_button.setEnabled(has_selection)
 
+    def run_script(self):
+        selected_file = self.selected_file()
+        if selected_file:
+            try:
+                self.console.run(self.release.extract(selected_file))
+            except Exception as e:
+                QMessageBox.critical(self, "Execution Error", str(e))
+
+    def closeEvent(self, event):
+        self.console.shutdown()
+        super().closeEvent(event)
+
     def open_in_cmd(self):
-        selected_file = self.file_list.currentItem().text()
+        selected_file = self.selected_file()
         if selected_file:
             try:
+                selected_file = self.release.extract(selected_file)
                 script_dir = os.path.dirname(selected_file)
                 script_name = os.path.basename(selected_file)
                 cmd_command = f'start cmd /K "cd /d {script_dir} && echo Press Enter to execute {script_name} && pause && python {script_name}"'
@@ -254,16 +737,16 @@ class FileExecutorApp(QMainWindow):
                 QMessageBox.critical(self, "Execution Error", str(e))
 
     def open_in_file_location(self):
-        selected_file = self.file_list.currentItem().text()
+        selected_file = self.selected_file()
         if selected_file:
             try:
-                file_dir = os.path.dirname(selected_file)
+                file_dir = os.path.dirname(self.release.extract(selected_file))
                 subprocess.run(f'explorer {file_dir}', shell=True)
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
 
     def delete_file(self):
-        selected_file = self.file_list.currentItem().text()
+        selected_file = self.selected_file()
         if selected_file:
             confirm = QMessageBox.question(
                 self, "Delete File", f"Are you sure you want to delete '{selected_file}'?",
@@ -271,16 +754,39 @@ class FileExecutorApp(QMainWindow):
             )
             if confirm == QMessageBox.Yes:
                 try:
-                    os.remove(selected_file)
-                    self.on_folder_select()
+                    # The file can't be taken out of the release zip, so remove any extracted copy and hide it
+                    local_path = self.release.local_path(selected_file)
+                    if os.path.exists(local_path):
+                        os.remove(local_path)
+                    self.config["hidden_files"] = self.config.get("hidden_files", []) + [selected_file]
+                    self.save_config(self.config)
+                    self.file_model.hide(selected_file)
                     QMessageBox.information(self, "Deleted", f"File '{selected_file}' has been deleted.")
                 except Exception as e:
                     QMessageBox.critical(self, "Error", f"Could not delete file: {e}")
 
     def install_required_packages(self):
-        packages_to_install = ["requests", "PySide6"]
-        install_packages(packages_to_install)
-        QMessageBox.information(self, "Installation Complete", "Required packages have been installed.")
+        # Everything the utilities need, checked in-process and installed with one pip run in the background
+        try:
+            packages_to_install = load_requirements()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Could not read the requirements: {e}")
+            return
+        self.install_button.setEnabled(False)
+        self.run_in_background(install_packages, self.on_packages_installed, packages_to_install,
+                               on_error=self.on_install_failed, on_progress=self.statusBar().showMessage)
+
+    def on_packages_installed(self, installed):
+        self.install_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        if installed:
+            QMessageBox.information(self, "Installation Complete", f"Installed {', '.join(installed)}.")
+        else:
+            QMessageBox.information(self, "Installation Complete", "Required packages are already installed.")
+
+    def on_install_failed(self, message):
+        self.install_button.setEnabled(True)
+        QMessageBox.critical(self, "Installation Failed", f"Could not install the packages: {message}")
 
     def open_settings(self):
         dialog = SettingsDialog(self.config, self.save_config, self)
@@ -292,7 +798,8 @@ class FileExecutorApp(QMainWindow):
 
 
 if __name__ == "__main__":
+    startup_time = time.perf_counter()
     app = QApplication(sys.argv)
-    window = FileExecutorApp()
+    window = FileExecutorApp(startup_time)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,181 @@
+# Builds a synthetic release zip and compares extracting it in full on every launch, as CentralUI
+# used to, with the incremental extraction, on a cold start (empty folder) and a warm start, and
+# how the startup time of each approach grows with the size of the release, then how long the file
+# list takes to fill, filter and update as a QListWidget and as the ReleaseFileModel.
+# Usage: python CentralUIBenchmark.py [number of files] [KB per file]   (default: 600 16)
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from CentralUI import (
+    ReleaseFileModel, ZipRelease, is_extracted, load_extract_manifest, save_extract_manifest, zip_manifest
+)
+
+RELEASE_SIZES = [100, 1000, 5000]
+LIST_SIZES = [1000, 10000, 50000]
+
+
+def make_release_zip(path, files=600, file_kb=16, seed=0):
+    rng = np.random.default_rng(seed)
+    # Source-like content: compressible but not trivially so
+    words = [bytes(rng.integers(97, 123, rng.integers(2, 10), dtype=np.uint8)) for _ in range(2000)]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for index in range(files):
+            chosen = rng.integers(0, len(words), file_kb * 1024 // 6)
+            content = b" ".join(words[i] for i in chosen)[:file_kb * 1024]
+            zip_ref.writestr(f"Python-Utilities/Folder{index % 12}/Script{index}.py", content)
+    return path
+
+
+def legacy_extract(zip_file_path, extracted_folder_path):
+    if not os.path.exists(extracted_folder_path):
+        os.makedirs(extracted_folder_path)
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        zip_ref.extractall(extracted_folder_path)
+
+
+def extract_zip_incremental(zip_file_path, extracted_folder_path):
+    """
+    Extracts only the members of a zip that are new, changed, or missing from the extracted folder
+    since the last extraction, and removes files that are no longer in the zip. This is what
+    CentralUI did at startup before it browsed the release through ZipRelease, kept here as a
+    baseline.
+
+    Returns:
+    dict: How many members were extracted, skipped and removed.
+    """
+    os.makedirs(extracted_folder_path, exist_ok=True)
+    previous = load_extract_manifest(extracted_folder_path)
+    extracted = skipped = removed = 0
+
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        manifest = zip_manifest(zip_ref)
+        for name, entry in manifest.items():
+            if is_extracted(previous, extracted_folder_path, name, entry):
+                skipped += 1
+                continue
+            zip_ref.extract(name, extracted_folder_path)
+            extracted += 1
+
+    for name in previous.keys() - manifest.keys():
+        target_path = os.path.normpath(os.path.join(extracted_folder_path, name))
+        # Never follow a name out of the extracted folder
+        if not target_path.startswith(os.path.normpath(extracted_folder_path) + os.sep):
+            continue
+        try:
+            os.remove(target_path)
+            removed += 1
+        except OSError:
+            pass
+
+    if extracted or removed or previous != manifest:
+        save_extract_manifest(extracted_folder_path, manifest)
+    return {"extracted": extracted, "skipped": skipped, "removed": removed}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    files, file_kb = (int(arg) for arg in (sys.argv[1:] + ["600", "16"][len(sys.argv) - 1:]))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        zip_path = make_release_zip(os.path.join(work_dir, "release.zip"), files, file_kb)
+        print(f"Release zip: {files} files, {files * file_kb / 1024:.1f} MB uncompressed, "
+              f"{os.path.getsize(zip_path) / 1e6:.1f} MB on disk")
+
+        for name, extract in (("extractall every launch", legacy_extract), ("incremental", extract_zip_incremental)):
+            target = os.path.join(work_dir, name.replace(" ", "_"))
+            cold, _ = timed(extract, zip_path, target)
+            warm = min(timed(extract, zip_path, target)[0] for _ in range(5))
+            print(f"  {name:<24} cold {cold * 1000:8.1f} ms   warm {warm * 1000:8.1f} ms")
+            shutil.rmtree(target)
+
+        # A release where one script changed and one was deleted by the user
+        target = os.path.join(work_dir, "partial")
+        extract_zip_incremental(zip_path, target)
+        os.remove(os.path.join(target, "Python-Utilities", "Folder0", "Script0.py"))
+        with zipfile.ZipFile(zip_path, "a") as zip_ref:
+            zip_ref.writestr("Python-Utilities/Folder1/New.py", b"print('new')\n")
+        elapsed, stats = timed(extract_zip_incremental, zip_path, target)
+        print(f"  {'incremental, 2 changed':<24} {elapsed * 1000:8.1f} ms, extracted {stats['extracted']}, "
+              f"skipped {stats['skipped']}")
+
+        startup_benchmark(work_dir)
+    file_list_benchmark()
+
+
+def startup_benchmark(work_dir):
+    """
+    Times what startup has to do before the window can show the folders, for releases of several sizes.
+    """
+    print("Startup work by release size, cold start:")
+    print(f"  {'files':>6} {'extractall':>11} {'incremental':>12} {'zip index':>10} {'open 1 script':>14}")
+    for files in RELEASE_SIZES:
+        zip_path = make_release_zip(os.path.join(work_dir, f"release_{files}.zip"), files, 4)
+        results = []
+        for extract in (legacy_extract, extract_zip_incremental, ZipRelease):
+            target = os.path.join(work_dir, f"startup_{files}")
+            elapsed, release = timed(extract, zip_path, target)
+            results.append(elapsed)
+            if extract is ZipRelease:
+                os.makedirs(target, exist_ok=True)
+                # Opening a script also extracts the rest of its folder
+                first = release.files(release.folders[0])[0]
+                results.append(timed(release.extract, first)[0])
+            shutil.rmtree(target, ignore_errors=True)
+        print(f"  {files:>6} " + " ".join(f"{elapsed * 1000:.1f} ms".rjust(width)
+                                         for elapsed, width in zip(results, (11, 12, 10, 14))))
+
+
+def file_list_benchmark():
+    """
+    Times filling the file list for one folder, typing a search, and a release update that adds
+    and removes one file, with the old clear and refill QListWidget and with the model.
+    """
+    from PySide6.QtWidgets import QApplication, QListView, QListWidget
+
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841, widgets need an application
+    print("File list by number of files in a folder:")
+    print(f"  {'files':>6} {'widget fill':>12} {'model fill':>11} {'widget search':>14} {'model search':>13} "
+          f"{'widget update':>14} {'model update':>13}")
+    for files in LIST_SIZES:
+        names = [f"Folder/Script{index}.py" for index in range(files)]
+        updated = names[1:] + ["Folder/New.py"]
+
+        def widget_fill(shown):
+            # addItems rather than addItem for every name, which is faster and in PySide6 6.12 loses a
+            # reference to None per call until Python aborts
+            widget.clear()
+            widget.addItems(shown)
+
+        widget = QListWidget()
+        fill = timed(widget_fill, names)[0]
+        # Searching used to mean filling the list again with the matching names
+        search = timed(widget_fill, [name for name in names if "script12" in name.lower()])[0]
+        update = timed(widget_fill, sorted(updated))[0]
+        results = [fill, None, search, None, update]
+
+        model = ReleaseFileModel()
+        view = QListView()
+        view.setUniformItemSizes(True)
+        view.setModel(model)
+        model.set_files(names)
+        results[1] = timed(model.set_folder, "Folder")[0]
+        results[3] = timed(model.set_search, "script12")[0]
+        model.set_search("")
+        results.append(timed(model.update_files, updated)[0])
+        print(f"  {files:>6} " + " ".join(f"{elapsed * 1000:.1f} ms".rjust(width)
+                                         for elapsed, width in zip(results, (12, 11, 14, 13, 14, 13))))
+
+
+if __name__ == "__main__":
+    main()
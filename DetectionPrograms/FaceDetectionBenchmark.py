@@ -0,0 +1,220 @@
+# Generates synthetic images with cartoon faces (which the Haar cascade picks up) and measures
+# face detection throughput, the speed and accuracy of each preset on large photos, and video
+# processing with the detector on every frame against detecting every few frames and tracking in between.
+# Usage: python FaceDetectionBenchmark.py [number of images] [number of large images] [video frames]   (default: 200 5 300)
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from FaceDetectionExperimental import (
+    CASCADE_PATH, PRESETS, _overlap, detect_faces, detect_faces_in_folder, detect_faces_in_video, track_faces
+)
+
+LARGE_SIZE = (5472, 3648)
+DETECT_EVERY_OPTIONS = [1, 3, 5, 10]
+
+
+def draw_face(image, cx, cy, size):
+    """
+    Draws a simple front-on face centred on (cx, cy) and returns its (x, y, w, h) box.
+    """
+    s = size
+    cv2.ellipse(image, (cx, cy), (int(s * 0.42), int(s * 0.55)), 0, 0, 360, (150, 180, 220), -1)
+    for side in (-1, 1):
+        eye_x = cx + side * int(s * 0.17)
+        cv2.ellipse(image, (eye_x, cy - int(s * 0.22)), (int(s * 0.11), int(s * 0.03)), 0, 0, 360, (40, 40, 60), -1)
+        cv2.ellipse(image, (eye_x, cy - int(s * 0.1)), (int(s * 0.08), int(s * 0.045)), 0, 0, 360, (50, 40, 40), -1)
+    cv2.line(image, (cx, cy - int(s * 0.05)), (cx, cy + int(s * 0.12)), (110, 130, 170), max(1, s // 30))
+    cv2.ellipse(image, (cx, cy + int(s * 0.27)), (int(s * 0.14), int(s * 0.04)), 0, 0, 360, (70, 70, 140), -1)
+    return (cx - s // 2, cy - s // 2, s, s)
+
+
+def make_synthetic_image(rng, width, height, faces=3, min_size=60, max_size=None):
+    """
+    Makes a textured image with a few non-overlapping faces on it.
+
+    Returns:
+    tuple: (image, list of (x, y, w, h) face boxes)
+    """
+    max_size = max_size or min(width, height) // 3
+    image = cv2.GaussianBlur(rng.integers(120, 230, (height // 8 + 1, width // 8 + 1, 3), dtype=np.uint8), (3, 3), 0)
+    image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+    boxes = []
+    for _ in range(faces * 20):
+        if len(boxes) == faces:
+            break
+        size = int(rng.integers(min_size, max_size + 1))
+        cx = int(rng.integers(size, width - size))
+        cy = int(rng.integers(size, height - size))
+        box = (cx - size, cy - size, 2 * size, 2 * size)
+        if any(abs(box[0] - other[0]) < max(box[2], other[2]) and abs(box[1] - other[1]) < max(box[3], other[3])
+               for other in boxes):
+            continue
+        boxes.append(box)
+    faces_drawn = [draw_face(image, x + w // 2, y + h // 2, w // 2) for (x, y, w, h) in boxes]
+    return cv2.GaussianBlur(image, (5, 5), 0), faces_drawn
+
+
+def write_synthetic_images(folder, count, width=1280, height=720, seed=0):
+    rng = np.random.default_rng(seed)
+    truth = {}
+    for index in range(count):
+        image, boxes = make_synthetic_image(rng, width, height)
+        path = os.path.join(folder, f"image_{index:05d}.jpg")
+        cv2.imwrite(path, image)
+        truth[path] = boxes
+    return truth
+
+
+def make_face_video(path, frames=300, width=1280, height=720, fps=30, seed=0):
+    """
+    Writes a video of a few faces drifting across a textured background.
+
+    Returns:
+    list: The (x, y, w, h) face boxes in each frame.
+    """
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(120, 230, (height // 8 + 1, width // 8 + 1, 3), dtype=np.uint8), (3, 3), 0)
+    background = cv2.resize(background, (width, height), interpolation=cv2.INTER_LINEAR)
+    faces = []
+    for number in range(3):
+        size = int(rng.integers(90, 160))
+        faces.append([width * (number + 1) // 4, int(rng.integers(size, height - size)), size,
+                      int(rng.integers(-4, 5)), int(rng.integers(-3, 4))])
+
+    truth = []
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'XVID'), fps, (width, height))
+    for _ in range(frames):
+        frame = background.copy()
+        boxes = []
+        for face in faces:
+            cx, cy, size, dx, dy = face
+            # Bounce off the edges
+            if not size < cx + dx < width - size:
+                face[3] = dx = -dx
+            if not size < cy + dy < height - size:
+                face[4] = dy = -dy
+            face[0], face[1] = cx + dx, cy + dy
+            boxes.append(draw_face(frame, face[0], face[1], size))
+        out.write(cv2.GaussianBlur(frame, (5, 5), 0))
+        truth.append(boxes)
+    out.release()
+    return truth
+
+
+def video_benchmark(frames):
+    """
+    Compares running the detector on every frame of a video with running it every few frames and tracking in between.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        video_path = os.path.join(work_dir, "faces.avi")
+        truth = make_face_video(video_path, frames)
+        cap = cv2.VideoCapture(video_path)
+        decoded = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            decoded.append(frame)
+        cap.release()
+
+        total = sum(len(boxes) for boxes in truth)
+        print(f"Synthetic 1280x720 video, {frames} frames with {total} faces in total:")
+        print(f"  {'detect every':<13} {'detection fps':>14} {'end to end fps':>15} {'speedup':>8} {'recall':>8} {'false':>6}")
+        baseline = None
+        for detect_every in DETECT_EVERY_OPTIONS:
+            hits = false = 0
+            start = time.perf_counter()
+            for (_, boxes), true_boxes in zip(track_faces(decoded, detect_every), truth):
+                found_hits, found_false = match_faces(boxes, true_boxes)
+                hits += found_hits
+                false += found_false
+            fps = len(decoded) / (time.perf_counter() - start)
+            stats = detect_faces_in_video(video_path, os.path.join(work_dir, "out.avi"), detect_every, display=False)
+            baseline = baseline or stats["fps"]
+            label = "every frame" if detect_every == 1 else f"{detect_every} frames"
+            print(f"  {label:<13} {fps:14.1f} {stats['fps']:15.1f} {stats['fps'] / baseline:7.1f}x "
+                  f"{hits / total:8.1%} {false:6}")
+
+
+def legacy_detect(image_paths):
+    # The old recognize_faces loaded the cascade again for every image
+    for image_path in image_paths:
+        face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
+        gray = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2GRAY)
+        face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+
+
+def match_faces(found, truth, min_overlap=0.3):
+    """
+    Counts how many of the true faces were found and how many detections were not faces.
+
+    Returns:
+    tuple: (faces found, false detections)
+    """
+    remaining = list(found)
+    hits = 0
+    for box in truth:
+        best = max(remaining, key=lambda other: _overlap(box, other), default=None)
+        if best is not None and _overlap(box, best) >= min_overlap:
+            remaining.remove(best)
+            hits += 1
+    return hits, len(remaining)
+
+
+def preset_benchmark(count):
+    """
+    Runs every preset over large 20 megapixel images and reports time per image, recall and false detections.
+    """
+    width, height = LARGE_SIZE
+    rng = np.random.default_rng(1)
+    # Faces from roughly 2% to 11% of the long side, the range a group photo usually covers
+    images = [make_synthetic_image(rng, width, height, faces=6, min_size=120, max_size=600) for _ in range(count)]
+    total = sum(len(boxes) for _, boxes in images)
+    print(f"{count} synthetic {width}x{height} images with {total} faces:")
+    print(f"  {'preset':<10} {'s per image':>12} {'speedup':>8} {'recall':>8} {'false':>6}")
+
+    baseline = None
+    for preset in reversed(list(PRESETS)):
+        hits = false = 0
+        start = time.perf_counter()
+        for image, boxes in images:
+            found_hits, found_false = match_faces(detect_faces(image, preset), boxes)
+            hits += found_hits
+            false += found_false
+        per_image = (time.perf_counter() - start) / count
+        baseline = baseline or per_image
+        print(f"  {preset:<10} {per_image:12.3f} {baseline / per_image:7.1f}x {hits / total:8.1%} {false:6}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    large_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    video_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        image_dir = os.path.join(work_dir, "images")
+        os.makedirs(image_dir)
+        truth = write_synthetic_images(image_dir, count)
+        print(f"{count} synthetic 1280x720 images with {sum(len(boxes) for boxes in truth.values())} faces:")
+
+        start = time.perf_counter()
+        legacy_detect(sorted(truth))
+        elapsed = time.perf_counter() - start
+        print(f"  {'legacy, cascade reloaded per image':<36} {count / elapsed:8.1f} images/s")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            stats = detect_faces_in_folder(image_dir, os.path.join(work_dir, "faces.jsonl"), workers)
+            print(f"  {f'batch, {workers} worker(s)':<36} {stats['images_per_second']:8.1f} images/s, "
+                  f"{stats['images_per_second_per_core']:.1f} per core, {stats['faces']} faces found")
+
+    preset_benchmark(large_count)
+    video_benchmark(video_frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,89 +1,569 @@
-import cv2
+import argparse
+import json
 import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-def main():
-    # Open the video file
-    video_path = input("Please enter the path for your video(Ensure that you replace \ with double \ or /): ")
+import cv2
+import numpy as np
+
+BLUR_SIZE = (21, 21)
+DIFF_THRESHOLD = 25
+MIN_CONTOUR_AREA = 500
+
+# "diff" compares each frame with the one before it, the others compare it with a background model
+ENGINES = ("diff", "average", "mog2")
+
+# How quickly the running average background takes in new frames
+BACKGROUND_ALPHA = 0.05
+
+# How many frames may wait between two stages before the earlier stage has to pause
+QUEUE_SIZE = 32
+
+# Put on a queue to tell the next stage there are no more frames
+_DONE = object()
+
+
+class StageTimer:
+    """
+    Keeps track of how many frames a pipeline stage handled and how long it spent working on them.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.frames = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds, frames=1):
+        with self._lock:
+            self.frames += frames
+            self.busy_seconds += seconds
+
+    @property
+    def fps(self):
+        return self.frames / self.busy_seconds if self.busy_seconds else 0.0
+
+
+def analysis_scale(frame_width, analysis_width=None):
+    """
+    Works out how much to shrink frames before looking for motion.
+
+    Args:
+    frame_width (int): The width of the video.
+    analysis_width (int): The widest frame to analyze, or None to use full resolution.
+
+    Returns:
+    float: The scale factor, at most 1.
+    """
+    if not analysis_width or analysis_width >= frame_width:
+        return 1.0
+    return analysis_width / frame_width
+
+
+def scaled_blur_size(scale):
+    # Keep the blur covering the same part of the picture at lower resolutions. Kernel sizes must be odd
+    size = max(3, int(round(BLUR_SIZE[0] * scale)) | 1)
+    return (size, size)
+
+
+def prepare_frame(frame, scale=1.0):
+    """
+    Converts a frame to blurred grayscale so it can be compared with its neighbours.
+
+    Args:
+    frame (numpy.ndarray): The BGR frame.
+    scale (float): How much to shrink the frame first, see analysis_scale.
+
+    Returns:
+    numpy.ndarray: The blurred grayscale frame.
+    """
+    if scale < 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.GaussianBlur(gray, scaled_blur_size(scale), 0)
+
+
+def find_motion(previous, current, min_area=MIN_CONTOUR_AREA, scale=1.0):
+    """
+    Finds the areas that changed between two prepared frames.
+
+    Args:
+    previous (numpy.ndarray): The earlier blurred grayscale frame.
+    current (numpy.ndarray): The later blurred grayscale frame.
+    min_area (int): Contours smaller than this many full resolution pixels are ignored.
+    scale (float): The scale the frames were prepared at. Boxes are mapped back to full resolution.
+
+    Returns:
+    list: (x, y, w, h) bounding boxes around the movement, in full resolution coordinates.
+    """
+    # Compute the absolute difference between the current frame and the previous frame
+    diff = cv2.absdiff(previous, current)
+
+    # Apply a binary threshold to the difference image and dilate it to fill in holes
+    _, thresh = cv2.threshold(diff, DIFF_THRESHOLD, 255, cv2.THRESH_BINARY)
+    thresh = cv2.dilate(thresh, None, iterations=2)
+
+    # Areas shrink with the square of the scale
+    scaled_min_area = min_area * scale * scale
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = [cv2.boundingRect(contour) for contour in contours if cv2.contourArea(contour) >= scaled_min_area]
+    if scale == 1.0:
+        return boxes
+    return [
+        (int(x / scale), int(y / scale), int(round(w / scale)), int(round(h / scale)))
+        for (x, y, w, h) in boxes
+    ]
+
+
+def draw_boxes(frame, boxes):
+    for (x, y, w, h) in boxes:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+
+class BackgroundModelDetector:
+    """
+    Finds motion by comparing each frame with a model of the background instead of only the
+    previous frame, so slow movement isn't missed.
+
+    "average" keeps a running average of past frames with cv2.accumulateWeighted, "mog2" uses
+    OpenCV's MOG2 background subtractor. Every per-frame buffer is allocated once up front and
+    reused through the dst arguments of the OpenCV calls, so the hot loop doesn't allocate.
+    Frames have to be fed in order, one at a time.
+    """
+
+    def __init__(self, frame_size, engine="average", scale=1.0, alpha=BACKGROUND_ALPHA, min_area=MIN_CONTOUR_AREA):
+        if engine not in ("average", "mog2"):
+            raise ValueError(f"Unknown background engine: {engine}")
+        self.engine = engine
+        self.scale = scale
+        self.alpha = alpha
+        self.min_area = min_area * scale * scale
+        self.blur_size = scaled_blur_size(scale)
+
+        width, height = frame_size
+        self.analysis_size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        analysis_width, analysis_height = self.analysis_size
+        self._small = np.empty((analysis_height, analysis_width, 3), dtype=np.uint8) if scale < 1.0 else None
+        self._gray = np.empty((analysis_height, analysis_width), dtype=np.uint8)
+        self._blurred = np.empty_like(self._gray)
+        self._diff = np.empty_like(self._gray)
+        self._thresh = np.empty_like(self._gray)
+        self._dilated = np.empty_like(self._gray)
+
+        if engine == "average":
+            self._background = np.empty((analysis_height, analysis_width), dtype=np.float32)
+            self._background_u8 = np.empty_like(self._gray)
+            self._subtractor = None
+        else:
+            self._subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+        self._started = False
+
+    def detect(self, frame):
+        """
+        Adds a frame to the background model and finds where it differs from the background.
+
+        Args:
+        frame (numpy.ndarray): The next BGR frame of the video.
+
+        Returns:
+        list: (x, y, w, h) bounding boxes around the movement, in full resolution coordinates.
+        """
+        source = frame
+        if self._small is not None:
+            cv2.resize(frame, self.analysis_size, dst=self._small, interpolation=cv2.INTER_AREA)
+            source = self._small
+        cv2.cvtColor(source, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.GaussianBlur(self._gray, self.blur_size, 0, dst=self._blurred)
+
+        if self._subtractor is not None:
+            self._subtractor.apply(self._blurred, self._diff)
+            cv2.threshold(self._diff, 127, 255, cv2.THRESH_BINARY, dst=self._thresh)
+        else:
+            if not self._started:
+                # The first frame becomes the starting background
+                self._background[:] = self._blurred
+                self._started = True
+                return []
+            # Compare with the background before the current frame is blended into it
+            cv2.convertScaleAbs(self._background, dst=self._background_u8)
+            cv2.absdiff(self._blurred, self._background_u8, dst=self._diff)
+            cv2.accumulateWeighted(self._blurred, self._background, self.alpha)
+            cv2.threshold(self._diff, DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self._thresh)
+
+        cv2.dilate(self._thresh, None, dst=self._dilated, iterations=2)
+        contours, _ = cv2.findContours(self._dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = [cv2.boundingRect(contour) for contour in contours if cv2.contourArea(contour) >= self.min_area]
+        if self.scale == 1.0:
+            return boxes
+        return [
+            (int(x / self.scale), int(y / self.scale), int(round(w / self.scale)), int(round(h / self.scale)))
+            for (x, y, w, h) in boxes
+        ]
+
+
+class MotionRecorder:
+    """
+    Writes processed frames to the output video and, optionally, every motion event to a
+    JSON Lines sidecar index so other tools can jump straight to the interesting parts.
+
+    In events-only mode only the frames around motion are encoded: pre_roll frames before
+    movement starts and post_roll frames after it stops, which keeps the output tiny for
+    mostly still footage. The sidecar records where each frame ended up in the output.
+    """
+
+    def __init__(self, output_path, fps, frame_size, events_only=False, pre_roll=0, post_roll=0, index_path=None):
+        self.output_path = output_path
+        self.fps = fps
+        self.frame_size = frame_size
+        self.events_only = events_only
+        self.post_roll = post_roll
+        self.written_frames = 0
+        self.segments = 0
+        self._out = None
+        self._pending = deque(maxlen=pre_roll) if events_only and pre_roll else None
+        self._post_roll_left = 0
+        self._segment = None
+        self._index = open(index_path, "w") if index_path else None
+
+    def _write(self, index, frame, boxes):
+        if self._out is None:
+            # Opened on first use so a video with no motion doesn't leave an empty file behind
+            fourcc = cv2.VideoWriter_fourcc(*'XVID')
+            self._out = cv2.VideoWriter(self.output_path, fourcc, self.fps, self.frame_size)
+        draw_boxes(frame, boxes)
+        self._out.write(frame)
+        if self._index is not None and boxes:
+            self._log({
+                "type": "motion",
+                "frame": index,
+                "time": self._time(index),
+                "output_frame": self.written_frames,
+                "boxes": [list(box) for box in boxes],
+            })
+        self.written_frames += 1
+
+    def _time(self, index):
+        return round(index / self.fps, 3) if self.fps else None
+
+    def _log(self, record):
+        self._index.write(json.dumps(record) + "\n")
+
+    def _end_segment(self):
+        if self._segment is None:
+            return
+        start_frame, output_start_frame, end_frame = self._segment
+        if self._index is not None:
+            self._log({
+                "type": "segment",
+                "start_frame": start_frame,
+                "end_frame": end_frame,
+                "start_time": self._time(start_frame),
+                "end_time": self._time(end_frame),
+                "output_start_frame": output_start_frame,
+            })
+        self.segments += 1
+        self._segment = None
+
+    def add(self, index, frame, boxes):
+        if not self.events_only:
+            self._write(index, frame, boxes)
+            return
+
+        if boxes:
+            if self._segment is None:
+                # Start a new segment with the frames leading up to the movement
+                first = self._pending[0][0] if self._pending else index
+                self._segment = [first, self.written_frames, index]
+                while self._pending:
+                    self._write(*self._pending.popleft())
+            self._write(index, frame, boxes)
+            self._segment[2] = index
+            self._post_roll_left = self.post_roll
+        elif self._segment is not None and self._post_roll_left > 0:
+            self._write(index, frame, boxes)
+            self._segment[2] = index
+            self._post_roll_left -= 1
+        else:
+            self._end_segment()
+            if self._pending is not None:
+                self._pending.append((index, frame, boxes))
+
+    def close(self):
+        self._end_segment()
+        if self._out is not None:
+            self._out.release()
+        if self._index is not None:
+            self._index.close()
+
+
+def _timed(timer, func, *args, frames=1):
+    start = time.perf_counter()
+    result = func(*args)
+    timer.add(time.perf_counter() - start, frames)
+    return result
+
+
+def _compare(timer, previous_future, current_future, scale):
+    # Runs in the worker pool; both frames were submitted before this task so waiting on them can't deadlock
+    previous = previous_future.result()
+    current = current_future.result()
+    return _timed(timer, find_motion, previous, current, MIN_CONTOUR_AREA, scale)
+
+
+def _put(stage_queue, item, errors):
+    # Gives up if another stage has crashed, since nobody may be left to empty the queue
+    while True:
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            if errors:
+                return
+
+
+def _run_stage(name, target, stop_event, errors, downstream):
+    # Make sure a crashing stage still lets the rest of the pipeline finish instead of hanging
+    try:
+        target()
+    except Exception as e:
+        errors.append((name, e))
+        stop_event.set()
+        if downstream is not None:
+            _put(downstream, _DONE, errors)
+
+
+def process_video(video_path, output_path, workers=None, display=True, analysis_width=None,
+                  events_only=False, pre_roll=1.0, post_roll=2.0, index_path=None, engine="diff"):
+    """
+    Detects movement in a video and writes a copy with boxes drawn around it.
+
+    Decoding, analysis and encoding run in separate threads joined by bounded queues,
+    and the blur/diff/threshold/contour work is spread over a pool of worker threads
+    (OpenCV releases the GIL while it works).
+
+    Args:
+    video_path (str): The video to read.
+    output_path (str): Where to write the processed video.
+    workers (int): The number of analysis threads. Defaults to the number of CPUs.
+    display (bool): Whether to show the frames in a window while processing. Press q to stop early.
+    analysis_width (int): Look for motion on frames shrunk to this width, which is much faster on
+        large videos. Boxes are still drawn at full resolution. None analyzes at full resolution.
+    events_only (bool): Only encode the frames around motion instead of the whole video.
+    pre_roll (float): Seconds of video to keep before motion starts, in events-only mode.
+    post_roll (float): Seconds of video to keep after motion stops, in events-only mode.
+    index_path (str): Where to write the JSON Lines index of motion events, or None for no index.
+    engine (str): "diff" compares neighbouring frames in the worker pool. "average" and "mog2"
+        use a BackgroundModelDetector, which has to see frames in order so it runs on one worker.
+
+    Returns:
+    dict: Frame counts, segments, wall time, overall fps and per-stage fps.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine}, expected one of {', '.join(ENGINES)}")
 
-    # Check if the file exists
-    if not os.path.exists(video_path):
-        print(f"Error: The file does not exist at the specified path: {video_path}")
-        return
-    
     cap = cv2.VideoCapture(video_path)
-    
     if not cap.isOpened():
-        print(f"Error: Could not open video file {video_path}")
-        return
+        raise IOError(f"Could not open video file {video_path}")
 
     # Get the frame width, height, and frames per second (fps) from the video
     frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     fps = cap.get(cv2.CAP_PROP_FPS)
+    scale = analysis_scale(frame_width, analysis_width)
 
-    # Define the codec and create VideoWriter object to save the video
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    output_path = os.path.join(os.path.expanduser('~'), 'Downloads', 'processed_video.avi')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (frame_width, frame_height))
+    recorder = MotionRecorder(
+        output_path, fps, (frame_width, frame_height), events_only,
+        pre_roll=int(pre_roll * fps), post_roll=int(post_roll * fps), index_path=index_path
+    )
 
-    # Read the first frame
-    ret, frame1 = cap.read()
-    if not ret:
-        print("Error: Could not read frame from video.")
-        return
+    timers = {name: StageTimer(name) for name in ("decode", "analyze", "encode")}
+    decode_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    result_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    display_queue = queue.Queue(maxsize=QUEUE_SIZE) if display else None
+    stop_event = threading.Event()
+    errors = []
 
-    # Convert the first frame to grayscale
-    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-    gray1 = cv2.GaussianBlur(gray1, (21, 21), 0)
-    
-    # Loop to read frames from the video
-    while True:
-        ret, frame2 = cap.read()
-        if not ret:
-            break
-        
-        # Convert the frame to grayscale
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.GaussianBlur(gray2, (21, 21), 0)
-        
-        # Compute the absolute difference between the current frame and the previous frame
-        diff = cv2.absdiff(gray1, gray2)
-        
-        # Apply a binary threshold to the difference image
-        _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
-        
-        # Dilate the thresholded image to fill in holes
-        thresh = cv2.dilate(thresh, None, iterations=2)
-        
-        # Find contours in the thresholded image
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Draw bounding boxes around the detected contours
-        for contour in contours:
-            if cv2.contourArea(contour) < 500:
+    def decode():
+        index = 0
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timers["decode"].add(time.perf_counter() - start)
+            _put(decode_queue, (index, frame), errors)
+            index += 1
+        _put(decode_queue, _DONE, errors)
+
+    def analyze_with_background_model():
+        detector = BackgroundModelDetector((frame_width, frame_height), engine, scale)
+        # A single worker runs the tasks in submission order, which the background model needs
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            while True:
+                item = decode_queue.get()
+                if item is _DONE:
+                    break
+                index, frame = item
+                boxes = pool.submit(_timed, timers["analyze"], detector.detect, frame)
+                _put(result_queue, (index, frame, boxes), errors)
+        _put(result_queue, _DONE, errors)
+
+    def analyze():
+        if engine != "diff":
+            analyze_with_background_model()
+            return
+        previous = None
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                item = decode_queue.get()
+                if item is _DONE:
+                    break
+                index, frame = item
+                # The frame is counted once, by the comparison, or here if it is the first and has nothing to be compared with
+                current = pool.submit(_timed, timers["analyze"], prepare_frame, frame, scale,
+                                      frames=1 if previous is None else 0)
+                if previous is None:
+                    boxes = pool.submit(lambda: [])
+                else:
+                    boxes = pool.submit(_compare, timers["analyze"], previous, current, scale)
+                _put(result_queue, (index, frame, boxes), errors)
+                previous = current
+        _put(result_queue, _DONE, errors)
+
+    def encode():
+        while True:
+            item = result_queue.get()
+            if item is _DONE:
+                break
+            index, frame, boxes = item
+            boxes = boxes.result()
+            start = time.perf_counter()
+            recorder.add(index, frame, boxes)
+            timers["encode"].add(time.perf_counter() - start)
+            if display_queue is not None:
+                _put(display_queue, frame, errors)
+        if display_queue is not None:
+            _put(display_queue, _DONE, errors)
+
+    threads = [
+        threading.Thread(target=_run_stage, args=(name, target, stop_event, errors, downstream), daemon=True)
+        for name, target, downstream in (
+            ("decode", decode, decode_queue),
+            ("analyze", analyze, result_queue),
+            ("encode", encode, display_queue),
+        )
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    if display_queue is not None:
+        # Windows have to be drawn from the main thread. Only wait 1 ms per frame so the display doesn't slow the pipeline down
+        while True:
+            frame = display_queue.get()
+            if frame is _DONE:
+                break
+            if stop_event.is_set():
                 continue
-            (x, y, w, h) = cv2.boundingRect(contour)
-            cv2.rectangle(frame2, (x, y), (x + w, y + h), (0, 255, 0), 2)
-        
-        # Write the frame with bounding boxes to the output video
-        out.write(frame2)
-        
-        # Display the frame with bounding boxes
-        cv2.imshow('Movement Detection', frame2)
-        
-        # Update the previous frame
-        gray1 = gray2.copy()
-        
-        # Break the loop if the 'q' key is pressed
-        if cv2.waitKey(30) & 0xFF == ord('q'):
-            break
-    
+            cv2.imshow('Movement Detection', frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                stop_event.set()
+
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
     # Release the video capture and writer objects, and close all OpenCV windows
     cap.release()
-    out.release()
-    cv2.destroyAllWindows()
+    recorder.close()
+    if display:
+        cv2.destroyAllWindows()
+
+    if errors:
+        name, error = errors[0]
+        raise RuntimeError(f"The {name} stage failed: {error}") from error
+
+    frames = timers["encode"].frames
+    return {
+        "frames": frames,
+        "written_frames": recorder.written_frames,
+        "segments": recorder.segments,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed else 0.0,
+        "stage_fps": {name: timer.fps for name, timer in timers.items()},
+    }
+
+
+def positive_int(value):
+    # For argparse, only accepts whole numbers of 1 or more
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def print_stats(stats):
+    print(f"Processed {stats['frames']} frames in {stats['seconds']:.2f} s ({stats['fps']:.1f} fps)")
+    if stats["written_frames"] != stats["frames"]:
+        print(f"Wrote {stats['written_frames']} frames in {stats['segments']} motion segments")
+    for name, stage_fps in stats["stage_fps"].items():
+        print(f"  {name:<8} {stage_fps:8.1f} fps")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw boxes around movement in a video.")
+    parser.add_argument("video", nargs="?", help="The video to process. You will be asked for it if it is left out.")
+    parser.add_argument("--output", default=os.path.join(os.path.expanduser('~'), 'Downloads', 'processed_video.avi'),
+                        help="Where to save the processed video (default: ~/Downloads/processed_video.avi)")
+    parser.add_argument("--headless", action="store_true", help="Don't show a window while processing")
+    parser.add_argument("--workers", type=positive_int, help="Number of analysis threads (default: number of CPUs)")
+    parser.add_argument("--analysis-width", type=int,
+                        help="Look for motion on frames shrunk to this width, e.g. 640 (default: full resolution)")
+    parser.add_argument("--engine", choices=ENGINES, default="diff",
+                        help="diff compares neighbouring frames (default), average and mog2 compare with a "
+                             "background model and also catch slow movement")
+    parser.add_argument("--events-only", action="store_true", help="Only save the parts of the video with motion")
+    parser.add_argument("--pre-roll", type=float, default=1.0,
+                        help="Seconds to keep before motion starts with --events-only (default 1)")
+    parser.add_argument("--post-roll", type=float, default=2.0,
+                        help="Seconds to keep after motion stops with --events-only (default 2)")
+    parser.add_argument("--index", help="Where to write the JSON Lines motion index "
+                                        "(default with --events-only: next to the output, ending in _events.jsonl)")
+    args = parser.parse_args()
+
+    # Open the video file
+    video_path = args.video or input("Please enter the path for your video(Ensure that you replace \\ with double \\ or /): ")
+
+    # Check if the file exists
+    if not os.path.exists(video_path):
+        print(f"Error: The file does not exist at the specified path: {video_path}")
+        return
+
+    try:
+        # Only write an index when one was asked for, or when the video is cut down to the events
+        index_path = args.index
+        if index_path is None and args.events_only:
+            index_path = os.path.splitext(args.output)[0] + "_events.jsonl"
+        stats = process_video(video_path, args.output, args.workers, display=not args.headless,
+                              analysis_width=args.analysis_width, events_only=args.events_only,
+                              pre_roll=args.pre_roll, post_roll=args.post_roll, index_path=index_path,
+                              engine=args.engine)
+    except IOError as e:
+        print(f"Error: {e}")
+        return
 
-    print(f"Processed video saved to {output_path}")
+    print_stats(stats)
+    if stats["written_frames"]:
+        print(f"Processed video saved to {args.output}")
+    else:
+        print("No motion was found, so no video was saved")
+    if index_path:
+        print(f"Motion index saved to {index_path}")
 
 if __name__ == "__main__":
     main()
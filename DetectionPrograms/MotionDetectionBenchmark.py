@@ -0,0 +1,252 @@
+# Generates a synthetic test video and compares the old serial motion detection loop with the pipeline.
+# Usage: python MotionDetectionBenchmark.py [frames] [width] [height]   (default: 300 1280 720)
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from MotionDetection import (
+    BackgroundModelDetector, analysis_scale, find_motion, prepare_frame, print_stats, process_video
+)
+
+ANALYSIS_WIDTHS = [None, 960, 640, 320]
+
+
+def make_synthetic_video(path, frames=300, width=1280, height=720, fps=30, seed=0, quiet_seconds=1):
+    """
+    Writes a video of a few squares moving over a still, textured background.
+    The squares move for two seconds and then hold still for quiet_seconds.
+    """
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+    size = max(20, height // 10)
+    movers = [
+        (rng.integers(0, width - size), rng.integers(0, height - size), rng.integers(-8, 9), rng.integers(-6, 7))
+        for _ in range(3)
+    ]
+
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'XVID'), fps, (width, height))
+    for index in range(frames):
+        frame = background.copy()
+        cycles, within = divmod(index, (2 + quiet_seconds) * fps)
+        step = cycles * 2 * fps + min(within, 2 * fps)
+        for number, (x, y, dx, dy) in enumerate(movers):
+            px = int(x + dx * step) % (width - size)
+            py = int(y + dy * step) % (height - size)
+            cv2.rectangle(frame, (px, py), (px + size, py + size), (40 + 70 * number, 200, 255 - 60 * number), -1)
+        out.write(frame)
+    out.release()
+    return path
+
+
+def legacy_process(video_path, output_path, wait_seconds=0.0):
+    # The original serial loop, minus the window. wait_seconds stands in for cv2.waitKey(30)
+    start = time.perf_counter()
+    cap = cv2.VideoCapture(video_path)
+    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'XVID'), cap.get(cv2.CAP_PROP_FPS),
+                          (frame_width, frame_height))
+    ret, frame1 = cap.read()
+    gray1 = cv2.GaussianBlur(cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY), (21, 21), 0)
+    frames = 0
+    while True:
+        ret, frame2 = cap.read()
+        if not ret:
+            break
+        gray2 = cv2.GaussianBlur(cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY), (21, 21), 0)
+        diff = cv2.absdiff(gray1, gray2)
+        _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+        thresh = cv2.dilate(thresh, None, iterations=2)
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            if cv2.contourArea(contour) < 500:
+                continue
+            (x, y, w, h) = cv2.boundingRect(contour)
+            cv2.rectangle(frame2, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        out.write(frame2)
+        gray1 = gray2.copy()
+        frames += 1
+        if wait_seconds:
+            time.sleep(wait_seconds)
+    cap.release()
+    out.release()
+    elapsed = time.perf_counter() - start
+    print(f"Processed {frames} frames in {elapsed:.2f} s ({frames / elapsed:.1f} fps)")
+
+
+def read_frames(video_path):
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def motion_mask(boxes, shape, cell=4):
+    # Coarse mask of the area covered by boxes, used to compare detections
+    mask = np.zeros((shape[0] // cell + 1, shape[1] // cell + 1), dtype=bool)
+    for (x, y, w, h) in boxes:
+        mask[y // cell:(y + h) // cell + 1, x // cell:(x + w) // cell + 1] = True
+    return mask
+
+
+def analyze_frames(frames, scale):
+    results = []
+    previous = prepare_frame(frames[0], scale)
+    for frame in frames[1:]:
+        current = prepare_frame(frame, scale)
+        results.append(find_motion(previous, current, scale=scale))
+        previous = current
+    return results
+
+
+def analysis_benchmark(video_path):
+    """
+    Times the analysis step alone at several analysis widths and checks how well the
+    detections agree with full resolution analysis.
+    """
+    frames = read_frames(video_path)
+    height, width = frames[0].shape[:2]
+    reference = None
+    print(f"{'analysis width':>15} {'fps':>8} {'same decision':>14} {'box IoU':>8}")
+    for analysis_width in ANALYSIS_WIDTHS:
+        scale = analysis_scale(width, analysis_width)
+        start = time.perf_counter()
+        results = analyze_frames(frames, scale)
+        fps = (len(frames) - 1) / (time.perf_counter() - start)
+        if reference is None:
+            reference = results
+
+        same_decision = sum(bool(a) == bool(b) for a, b in zip(reference, results)) / len(results)
+        ious = []
+        for a, b in zip(reference, results):
+            if a or b:
+                mask_a, mask_b = motion_mask(a, (height, width)), motion_mask(b, (height, width))
+                ious.append((mask_a & mask_b).sum() / (mask_a | mask_b).sum())
+        iou = sum(ious) / len(ious) if ious else 1.0
+        print(f"{analysis_width or width:>15} {fps:8.1f} {same_decision:>14.1%} {iou:8.2f}")
+
+
+def events_benchmark(frames, width, height):
+    """
+    Compares writing every frame with writing only motion segments on mostly still footage.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Two seconds of movement in every thirty
+        video_path = make_synthetic_video(os.path.join(work_dir, "quiet.avi"), max(frames, 900), width, height,
+                                          quiet_seconds=28)
+        print("Mostly still footage, full recording vs events only:")
+        for events_only in (False, True):
+            output_path = os.path.join(work_dir, f"out_{events_only}.avi")
+            index_path = os.path.join(work_dir, f"out_{events_only}.jsonl")
+            stats = process_video(video_path, output_path, display=False, analysis_width=640,
+                                  events_only=events_only, pre_roll=0.5, post_roll=0.5, index_path=index_path)
+            size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            print(f"  {'events only' if events_only else 'every frame':<12} {stats['seconds']:6.2f} s, "
+                  f"wrote {stats['written_frames']} of {stats['frames']} frames, {size / 1e6:.2f} MB video, "
+                  f"{os.path.getsize(index_path) / 1e3:.1f} kB index")
+
+
+def legacy_analysis(frames):
+    # The analysis part of the original loop, including the gray2.copy() every frame
+    gray1 = cv2.GaussianBlur(cv2.cvtColor(frames[0], cv2.COLOR_BGR2GRAY), (21, 21), 0)
+    for frame2 in frames[1:]:
+        gray2 = cv2.GaussianBlur(cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY), (21, 21), 0)
+        diff = cv2.absdiff(gray1, gray2)
+        _, thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+        thresh = cv2.dilate(thresh, None, iterations=2)
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        [cv2.boundingRect(contour) for contour in contours if cv2.contourArea(contour) >= 500]
+        gray1 = gray2.copy()
+        yield
+
+
+def diff_analysis(frames):
+    previous = prepare_frame(frames[0])
+    for frame in frames[1:]:
+        current = prepare_frame(frame)
+        find_motion(previous, current)
+        previous = current
+        yield
+
+
+def background_analysis(frames, engine):
+    height, width = frames[0].shape[:2]
+    detector = BackgroundModelDetector((width, height), engine)
+    for frame in frames:
+        detector.detect(frame)
+        yield
+
+
+def engine_benchmark(video_path):
+    """
+    Compares the speed and the per-frame memory churn of the frame-diff and background model engines.
+    Churn is the most temporary memory allocated while one frame was analyzed.
+    """
+    frames = read_frames(video_path)
+    print(f"{'engine':>22} {'fps':>8} {'churn per frame':>16}")
+    for name, steps in (
+        ("legacy frame diff", lambda: legacy_analysis(frames)),
+        ("frame diff", lambda: diff_analysis(frames)),
+        ("running average", lambda: background_analysis(frames, "average")),
+        ("MOG2", lambda: background_analysis(frames, "mog2")),
+    ):
+        start = time.perf_counter()
+        count = sum(1 for _ in steps())
+        fps = count / (time.perf_counter() - start)
+
+        # Run again under tracemalloc, which numpy reports its buffers to
+        tracemalloc.start()
+        churn = 0
+        iterator = steps()
+        while True:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            try:
+                next(iterator)
+            except StopIteration:
+                break
+            churn += tracemalloc.get_traced_memory()[1] - before
+        tracemalloc.stop()
+        print(f"{name:>22} {fps:8.1f} {churn / count / 1e6:13.2f} MB")
+
+
+def main():
+    frames, width, height = (int(arg) for arg in (sys.argv[1:] + ["300", "1280", "720"][len(sys.argv) - 1:]))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        video_path = make_synthetic_video(os.path.join(work_dir, "synthetic.avi"), frames, width, height)
+        output_path = os.path.join(work_dir, "processed.avi")
+        print(f"Synthetic video: {frames} frames at {width}x{height}")
+
+        print("Legacy serial loop with the 30 ms waitKey:")
+        legacy_process(video_path, output_path, wait_seconds=0.03)
+        print("Legacy serial loop, no display:")
+        legacy_process(video_path, output_path)
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            print(f"Pipeline, headless, {workers} analysis worker(s):")
+            print_stats(process_video(video_path, output_path, workers, display=False))
+        print("Pipeline, headless, analysis at 640 wide:")
+        print_stats(process_video(video_path, output_path, display=False, analysis_width=640))
+
+        print("Analysis step only:")
+        analysis_benchmark(video_path)
+
+        print("Motion engines:")
+        engine_benchmark(video_path)
+
+    events_benchmark(frames, width, height)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,130 @@
 import secrets
 import string
+from functools import lru_cache
 
-passwordLengthAnswer = int(input("How long would you like your password to be? → "))
-MemorableWord = input("Enter a memorable word → ")
+LETTERS = string.ascii_letters
+DIGITS = string.digits
+SPECIAL_CHARS = string.punctuation
+ALPHABET = LETTERS + DIGITS + SPECIAL_CHARS
 
-def create_pw(pw_length=passwordLengthAnswer):
-   letters = string.ascii_letters
-   digits = string.digits
-   special_chars = string.punctuation
+_CLASS_TABLE = bytes.maketrans(
+   ALPHABET.encode(), b"l" * len(LETTERS) + b"d" * len(DIGITS) + b"s" * len(SPECIAL_CHARS)
+)
+_LETTER, _DIGIT, _SPECIAL = b"lds"
 
-   alphabet = letters + digits + special_chars
-   pwd = ''
-   pw_strong = False
+# Passwords are written to files in batches of this size
+BATCH_SIZE = 100000
 
-   while not pw_strong:
-       pwd = ''
-       for i in range(pw_length):
-           pwd += ''.join(secrets.choice(alphabet))
+_random = secrets.SystemRandom()
 
-       if (any(char in special_chars for char in pwd) and
-               sum(char in digits for char in pwd) >= 2):
-           pw_strong = True
 
-   return pwd
+@lru_cache(maxsize=None)
+def _sampling_tables(alphabet):
+   # Random bytes at or above accept_below are thrown away so every character is equally likely
+   accept_below = 256 - 256 % len(alphabet)
+   table = bytes(ord(alphabet[byte % len(alphabet)]) for byte in range(256))
+   return accept_below, table, bytes(range(accept_below, 256))
+
+
+def _random_chars(alphabet, count):
+   accept_below, table, rejected = _sampling_tables(alphabet)
+   chars = bytearray()
+   while len(chars) < count:
+       needed = count - len(chars)
+       # translate deletes the rejected bytes and maps the rest onto the alphabet in one C-level call
+       chars += secrets.token_bytes(needed * 256 // accept_below + 16).translate(table, rejected)
+   del chars[count:]
+   return chars
+
+
+def _enforce_policy(password, kinds, min_digits, min_special, digit_pool, special_pool):
+   digits, specials, letters = [], [], []
+   for position, kind in enumerate(kinds):
+       if kind == _LETTER:
+           letters.append(position)
+       elif kind == _DIGIT:
+           digits.append(position)
+       else:
+           specials.append(position)
+   missing_digits = max(0, min_digits - len(digits))
+   missing_specials = max(0, min_special - len(specials))
+
+   # Only overwrite letters, or surplus characters of the other class, so nothing drops below its minimum
+   spare = letters
+   if not missing_specials:
+       spare += specials[min_special:]
+   if not missing_digits:
+       spare += digits[min_digits:]
+
+   # Partial Fisher-Yates shuffle picks the positions to overwrite
+   for i in range(missing_digits + missing_specials):
+       j = i + _random.randrange(len(spare) - i)
+       spare[i], spare[j] = spare[j], spare[i]
+       password[spare[i]] = next(digit_pool) if i < missing_digits else next(special_pool)
+
+
+def generate_passwords(count, pw_length=12, min_digits=2, min_special=1):
+   """
+   Generates many random passwords at once from a single buffer of secure random bytes.
+
+   Args:
+   count (int): How many passwords to make.
+   pw_length (int): The length of each password.
+   min_digits (int): The fewest digits a password may contain.
+   min_special (int): The fewest special characters a password may contain.
+
+   Returns:
+   list: The passwords.
+   """
+   if pw_length < min_digits + min_special:
+       raise ValueError("The password is too short to fit the required digits and special characters")
+
+   chars = _random_chars(ALPHABET, count * pw_length)
+   kinds = chars.translate(_CLASS_TABLE)
+   # Replacement characters for passwords that miss the policy, drawn up front in bulk
+   digit_pool = iter(_random_chars(DIGITS, count * min_digits))
+   special_pool = iter(_random_chars(SPECIAL_CHARS, count * min_special))
+   passwords = []
+   for start in range(0, count * pw_length, pw_length):
+       end = start + pw_length
+       if kinds.count(b"d", start, end) < min_digits or kinds.count(b"s", start, end) < min_special:
+           # Patch up the few characters that are missing instead of throwing the whole password away
+           password = chars[start:end]
+           _enforce_policy(password, kinds[start:end], min_digits, min_special, digit_pool, special_pool)
+           passwords.append(password.decode("ascii"))
+       else:
+           passwords.append(chars[start:end].decode("ascii"))
+   return passwords
+
+
+def write_passwords(file_path, count, pw_length=12, prefix="", batch_size=BATCH_SIZE):
+   """
+   Generates passwords in batches and streams them to a file, one per line.
+
+   Args:
+   file_path (str): The file to write.
+   count (int): How many passwords to make.
+   pw_length (int): The length of each password, not counting the prefix.
+   prefix (str): Text to put in front of every password, such as a memorable word.
+   batch_size (int): How many passwords to generate at a time.
+
+   Returns:
+   int: The number of passwords written.
+   """
+   written = 0
+   with open(file_path, "w") as file:
+       while written < count:
+           batch = generate_passwords(min(batch_size, count - written), pw_length)
+           file.write("".join(f"{prefix}{password}\n" for password in batch))
+           written += len(batch)
+   return written
+
+
+def create_pw(pw_length=12):
+   return generate_passwords(1, pw_length)[0]
 
 
 if __name__ == '__main__':
-   print(MemorableWord + create_pw())
+   passwordLengthAnswer = int(input("How long would you like your password to be? → "))
+   MemorableWord = input("Enter a memorable word → ")
+   print(MemorableWord + create_pw(passwordLengthAnswer))
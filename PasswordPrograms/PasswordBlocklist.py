@@ -0,0 +1,218 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
+from hashlib import blake2b
+
+import numpy as np
+
+# File layout: header, Bloom filter bits, then every password hash as a sorted little-endian uint64
+MAGIC = b"PWBLOCK1"
+HEADER = struct.Struct("<8sIIQQ")  # magic, number of hash functions, reserved, number of bits, number of entries
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+# How bytes that aren't valid UTF-8 are read and hashed everywhere. surrogateescape turns them into
+# stand-in characters and back into the same bytes, so such passwords still match the blocklist
+ENCODING_ERRORS = "surrogateescape"
+
+# How many hashes are turned back into Python ints at a time while filling the Bloom filter
+BLOOM_CHUNK_SIZE = 65536
+
+
+def password_hash(password):
+    """
+    Hashes a password the way the blocklist stores it. Passwords are lowercased first,
+    just like the COMMON_PASSWORDS check.
+
+    Args:
+    password (str): The password to hash.
+
+    Returns:
+    int: A 64 bit hash.
+    """
+    digest = blake2b(password.lower().encode("utf-8", ENCODING_ERRORS), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _bloom_step(key):
+    # Second hash for double hashing, mixed out of the key (high half of a golden ratio multiply) so only one hash is stored
+    return (key * 0x9E3779B97F4A7C15) >> 64 | 1
+
+
+def bloom_parameters(entries, false_positive_rate):
+    """
+    Works out the Bloom filter size and number of hash functions for a target false positive rate.
+
+    Args:
+    entries (int): The number of passwords in the filter.
+    false_positive_rate (float): The chance a password not in the list passes the filter, e.g. 0.001.
+
+    Returns:
+    tuple: (number of bits, number of hash functions)
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("The false positive rate must be between 0 and 1")
+    entries = max(entries, 1)
+    bits = math.ceil(-entries * math.log(false_positive_rate) / math.log(2) ** 2)
+    bits = (bits + 63) // 64 * 64  # Round up so the hash array after it stays 8 byte aligned
+    hash_count = max(1, round(bits / entries * math.log(2)))
+    return bits, hash_count
+
+
+def build_blocklist(source_path, output_path, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE):
+    """
+    Compiles a plain text password list (one per line) into the on-disk blocklist format.
+
+    Args:
+    source_path (str): The plain text password list.
+    output_path (str): Where to write the compiled blocklist.
+    false_positive_rate (float): The Bloom filter false positive rate.
+
+    Returns:
+    int: The number of unique passwords written.
+    """
+    keys = array("Q")
+    with open(source_path, "r", encoding="utf-8", errors=ENCODING_ERRORS) as file:
+        for line in file:
+            password = line.rstrip("\r\n")
+            if password:
+                keys.append(password_hash(password))
+
+    # Sort the hashes in place, 8 bytes each, then drop duplicates in one pass over the sorted array
+    sorted_keys = np.frombuffer(keys, dtype=np.uint64)
+    sorted_keys.sort()
+    is_first = np.ones(len(sorted_keys), dtype=bool)
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_first[1:])
+    unique_keys = sorted_keys[is_first]
+    del sorted_keys, is_first, keys
+
+    bits, hash_count = bloom_parameters(len(unique_keys), false_positive_rate)
+    bloom = bytearray(bits // 8)
+    for start in range(0, len(unique_keys), BLOOM_CHUNK_SIZE):
+        # Python ints, since the Bloom filter positions must not wrap around at 64 bits
+        for key in unique_keys[start:start + BLOOM_CHUNK_SIZE].tolist():
+            step = _bloom_step(key)
+            for i in range(hash_count):
+                bit = (key + i * step) % bits
+                bloom[bit >> 3] |= 1 << (bit & 7)
+
+    # Write to a temporary file first so a half written blocklist is never picked up
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, hash_count, 0, bits, len(unique_keys)))
+        file.write(bloom)
+        unique_keys.astype("<u8", copy=False).tofile(file)
+    os.replace(temp_path, output_path)
+    return len(unique_keys)
+
+
+class PasswordBlocklist:
+    """
+    A compiled password blocklist opened with mmap, so loading is instant and only
+    the pages that lookups touch are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a password blocklist")
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a password blocklist")
+        magic, self.hash_count, _, self.bits, self.entries = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a password blocklist")
+        self._bloom_offset = HEADER.size
+        self._keys_offset = self._bloom_offset + self.bits // 8
+        if len(self._mmap) < self._keys_offset + self.entries * 8:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self):
+        return self.entries
+
+    def might_contain(self, password, key=None):
+        """
+        Checks only the Bloom filter. False means definitely not in the list, True means probably.
+        """
+        if key is None:
+            key = password_hash(password)
+        step = _bloom_step(key)
+        data = self._mmap
+        bloom_offset = self._bloom_offset
+        bits = self.bits
+        for i in range(self.hash_count):
+            bit = (key + i * step) % bits
+            if not data[bloom_offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def __contains__(self, password):
+        key = password_hash(password)
+
+        # Fast negative answer: most passwords fail the Bloom filter and never touch the index
+        if not self.might_contain(password, key):
+            return False
+
+        # Binary search the sorted hash array to confirm
+        data = self._mmap
+        offset = self._keys_offset
+        low, high = 0, self.entries
+        while low < high:
+            middle = (low + high) // 2
+            value = struct.unpack_from("<Q", data, offset + middle * 8)[0]
+            if value < key:
+                low = middle + 1
+            elif value > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a breached password blocklist.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compile a plain text password list")
+    build.add_argument("source", help="Plain text file with one password per line")
+    build.add_argument("output", help="Where to write the compiled blocklist")
+    build.add_argument("--fp-rate", type=float, default=DEFAULT_FALSE_POSITIVE_RATE,
+                       help=f"Bloom filter false positive rate (default {DEFAULT_FALSE_POSITIVE_RATE})")
+
+    check = commands.add_parser("check", help="Check passwords against a compiled blocklist")
+    check.add_argument("blocklist", help="The compiled blocklist")
+    check.add_argument("passwords", nargs="+", help="Passwords to look up")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        start = time.perf_counter()
+        count = build_blocklist(args.source, args.output, args.fp_rate)
+        print(f"Wrote {count} passwords to {args.output} in {time.perf_counter() - start:.1f} s")
+    else:
+        with PasswordBlocklist(args.blocklist) as blocklist:
+            for password in args.passwords:
+                print(f"{password}: {'BREACHED' if password in blocklist else 'not found'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Measures build time, load time, lookup latency and memory of the compiled password blocklist
+# compared with loading the same list into a Python set.
+# Usage: python PasswordBlocklistBenchmark.py [number of passwords]   (default: 1000000)
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from PasswordBlocklist import PasswordBlocklist, build_blocklist
+
+LOOKUPS = 100000
+
+
+def write_password_list(path, count, rng):
+    alphabet = string.ascii_lowercase + string.digits
+    passwords = ["".join(rng.choices(alphabet, k=rng.randint(6, 14))) for _ in range(count)]
+    with open(path, "w") as file:
+        file.write("\n".join(passwords) + "\n")
+    return passwords
+
+
+def measure_lookups(name, lookup, passwords):
+    start = time.perf_counter()
+    found = sum(1 for password in passwords if lookup(password))
+    seconds = time.perf_counter() - start
+    print(f"  {name:<36} {seconds / len(passwords) * 1e6:8.2f} us/lookup  ({found} found)")
+    return found
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_path = os.path.join(work_dir, "passwords.txt")
+        blocklist_path = os.path.join(work_dir, "passwords.blocklist")
+        passwords = write_password_list(source_path, count, rng)
+        hits = rng.sample(passwords, min(LOOKUPS, count))
+        misses = ["".join(rng.choices(string.ascii_uppercase, k=10)) for _ in range(LOOKUPS)]
+        del passwords
+
+        print(f"{count:,} passwords:")
+        for rate in (0.01, 0.001):
+            start = time.perf_counter()
+            build_blocklist(source_path, blocklist_path, rate)
+            build_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            blocklist = PasswordBlocklist(blocklist_path)
+            load_seconds = time.perf_counter() - start
+
+            print(f" false positive rate {rate}: build {build_seconds:.1f} s, load {load_seconds * 1000:.2f} ms, "
+                  f"file {os.path.getsize(blocklist_path) / 1e6:.1f} MB "
+                  f"({blocklist.bits // 8 / 1e6:.1f} MB Bloom filter, {blocklist.hash_count} hashes)")
+            measure_lookups("blocklist, present", blocklist.__contains__, hits)
+            measure_lookups("blocklist, absent", blocklist.__contains__, misses)
+            bloom_passes = sum(1 for password in misses if blocklist.might_contain(password))
+            print(f"  measured Bloom false positive rate   {bloom_passes / len(misses):.4f}")
+            blocklist.close()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with open(source_path, "r") as file:
+            password_set = set(line.rstrip("\n") for line in file)
+        load_seconds = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f" Python set: load {load_seconds:.2f} s, {memory / 1e6:.1f} MB of memory")
+        measure_lookups("set, present", password_set.__contains__, hits)
+        measure_lookups("set, absent", password_set.__contains__, misses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Compares the old regex-based password checker with the single-pass batch scorer.
+# Usage: python PasswordCheckerBenchmark.py [number of passwords]   (default: 1000000)
+import math
+import os
+import random
+import re
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+from PasswordStrength import score_passwords
+
+LEGACY_COMMON_PASSWORDS = [
+    "123456", "password", "123456789", "12345", "12345678", "qwerty", "abc123", "password1"
+]
+
+
+def legacy_calculate_entropy(password):
+    possible_characters = 0
+    if re.search(r'[a-z]', password):
+        possible_characters += 26
+    if re.search(r'[A-Z]', password):
+        possible_characters += 26
+    if re.search(r'[0-9]', password):
+        possible_characters += 10
+    if re.search(r'[\W_]', password):
+        possible_characters += 32
+    return len(password) * math.log2(possible_characters) if possible_characters > 0 else 0
+
+
+def legacy_check_password_strength(password):
+    score = sum([
+        len(password) >= 8,
+        re.search(r'[A-Z]', password) is not None,
+        re.search(r'[a-z]', password) is not None,
+        re.search(r'[0-9]', password) is not None,
+        re.search(r'[\W_]', password) is not None,
+        password.lower() not in LEGACY_COMMON_PASSWORDS,
+        legacy_calculate_entropy(password) >= 40,
+    ])
+    if score == 7:
+        return "Very Strong"
+    elif score == 6:
+        return "Strong"
+    elif score == 5:
+        return "Medium"
+    else:
+        return "Weak"
+
+
+def generate_passwords(count, seed=42):
+    rng = random.Random(seed)
+    alphabets = [string.ascii_lowercase, string.ascii_letters, string.ascii_letters + string.digits,
+                 string.ascii_letters + string.digits + string.punctuation + " é"]
+    passwords = [rng.choice(LEGACY_COMMON_PASSWORDS) for _ in range(count // 100)]
+    while len(passwords) < count:
+        alphabet = rng.choice(alphabets)
+        passwords.append("".join(rng.choices(alphabet, k=rng.randint(4, 20))))
+    return passwords
+
+
+def timed(name, count, func):
+    start = time.perf_counter()
+    results = func()
+    seconds = time.perf_counter() - start
+    print(f"  {name:<28} {seconds:8.3f} s  {count / seconds:12,.0f} passwords/s")
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    passwords = generate_passwords(count)
+    print(f"Scoring {count:,} passwords:")
+
+    legacy = timed("legacy regex checker", count,
+                   lambda: [legacy_check_password_strength(p) for p in passwords])
+    single = timed("single-pass, 1 process", count,
+                   lambda: [strength for _, strength in score_passwords(passwords)])
+    workers = os.cpu_count() or 1
+    multi = timed(f"single-pass, {workers} processes", count,
+                  lambda: [strength for _, strength in score_passwords(passwords, workers=workers)])
+
+    detailed = timed("analyze_password, 1 process", count,
+                     lambda: [result["strength"] for _, result in score_passwords(passwords, detailed=True)])
+
+    if legacy != single or legacy != multi or legacy != detailed:
+        print("WARNING: results differ from the legacy checker")
+    else:
+        print("All results match the legacy checker")
+
+    # End to end: stream the passwords through the command line mode and write JSON Lines
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_path = os.path.join(work_dir, "passwords.txt")
+        with open(input_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(passwords) + "\n")
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PasswordStrength.py")
+        with open(input_path, "rb") as stdin:
+            timed("CLI, stdin to JSON Lines", count,
+                  lambda: subprocess.run([sys.executable, script], stdin=stdin,
+                                         stdout=subprocess.DEVNULL, check=True))
+
+
+if __name__ == "__main__":
+    main()
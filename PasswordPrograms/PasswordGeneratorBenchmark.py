@@ -0,0 +1,64 @@
+# Compares the old one-character-at-a-time generator with the bulk generator.
+# Usage: python PasswordGeneratorBenchmark.py [number of passwords]   (default: 1000000)
+import os
+import secrets
+import string
+import sys
+import tempfile
+import time
+
+from MemorablePasswordGenerator import generate_passwords, write_passwords
+
+# The old generator is much slower, so it only makes this many passwords and the rate is compared
+LEGACY_COUNT = 50000
+
+
+def legacy_create_pw(pw_length):
+    letters = string.ascii_letters
+    digits = string.digits
+    special_chars = string.punctuation
+    alphabet = letters + digits + special_chars
+    pwd = ''
+    pw_strong = False
+    while not pw_strong:
+        pwd = ''
+        for i in range(pw_length):
+            pwd += ''.join(secrets.choice(alphabet))
+        if (any(char in special_chars for char in pwd) and
+                sum(char in digits for char in pwd) >= 2):
+            pw_strong = True
+    return pwd
+
+
+def timed(name, count, func):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    print(f"  {name:<24} {count:>9,} in {seconds:7.3f} s  {count / seconds:12,.0f} passwords/s")
+
+
+def check_policy(passwords, pw_length):
+    for password in passwords:
+        assert len(password) == pw_length
+        assert sum(char in string.digits for char in password) >= 2
+        assert any(char in string.punctuation for char in password)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    for pw_length in (8, 12, 20):
+        print(f"Length {pw_length}:")
+        legacy_count = min(count, LEGACY_COUNT)
+        timed("legacy create_pw", legacy_count, lambda: [legacy_create_pw(pw_length) for _ in range(legacy_count)])
+        timed("generate_passwords", count, lambda: generate_passwords(count, pw_length))
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "passwords.txt")
+            timed("write_passwords to file", count, lambda: write_passwords(path, count, pw_length))
+
+        check_policy(generate_passwords(min(count, 100000), pw_length), pw_length)
+
+
+if __name__ == "__main__":
+    main()
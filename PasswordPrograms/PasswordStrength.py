@@ -0,0 +1,259 @@
+import argparse
+import io
+import json
+import math
+import os
+import string
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PasswordBlocklist import ENCODING_ERRORS, PasswordBlocklist
+
+# List of commonly used passwords (you can expand this list as needed)
+COMMON_PASSWORDS = frozenset([
+    "123456", "password", "123456789", "12345", "12345678", "qwerty", "abc123", "password1"
+])
+
+# Compiled breached password list made with PasswordBlocklist.py. It is used automatically if it exists.
+BLOCKLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "breached_passwords.blocklist")
+_blocklist = None
+
+# Maps every ASCII character onto a one-letter class name (lower, upper, digit, special)
+# so a single translate call classifies a whole password. Non-ASCII characters are left as they are.
+_ASCII_SPECIAL = "".join(chr(code) for code in range(128) if not chr(code).isalnum() or chr(code) == "_")
+CLASS_TABLE = str.maketrans(
+    string.ascii_lowercase + string.ascii_uppercase + string.digits + _ASCII_SPECIAL,
+    "l" * 26 + "u" * 26 + "d" * 10 + "s" * len(_ASCII_SPECIAL)
+)
+CLASS_NAMES = ["lower", "upper", "digit", "special"]
+
+# How many characters each class adds to the pool used for the entropy estimate
+CLASS_POOL_SIZES = {"lower": 26, "upper": 26, "digit": 10, "special": 32}
+
+# Passwords are sent to worker processes in batches of this size
+BATCH_SIZE = 10000
+
+STRENGTHS = {7: "Very Strong", 6: "Strong", 5: "Medium"}
+
+
+# Function to work out the number of classes and the entropy bits per character for each class bitmask
+def _mask_summary(mask):
+    classes = [name for bit, name in enumerate(CLASS_NAMES) if mask & (1 << bit)]
+    possible_characters = sum(CLASS_POOL_SIZES[name] for name in classes)
+    bits_per_char = math.log2(possible_characters) if possible_characters > 0 else 0.0
+    return len(classes), bits_per_char
+
+
+MASK_SUMMARIES = [_mask_summary(mask) for mask in range(16)]
+
+
+# Function to find which character classes a password uses, as a bitmask in CLASS_NAMES order
+def _class_mask(password, translated=None):
+    if translated is None:
+        translated = password.translate(CLASS_TABLE)
+    mask = ("l" in translated) | ("u" in translated) << 1 | ("d" in translated) << 2 | ("s" in translated) << 3
+    # Non-ASCII symbols are special characters too, non-ASCII letters aren't counted at all
+    if not mask & 8 and not password.isascii():
+        if any(not char.isalnum() for char in translated if ord(char) > 127):
+            mask |= 8
+    return mask
+
+
+# Function to find which character classes a password uses in a single pass
+def classify_password(password):
+    mask = _class_mask(password)
+    return {name for bit, name in enumerate(CLASS_NAMES) if mask & (1 << bit)}
+
+
+# Function to switch to a different compiled blocklist, or turn it off by passing None
+def load_blocklist(path=BLOCKLIST_PATH):
+    global _blocklist
+    if _blocklist is not None:
+        _blocklist.close()
+    _blocklist = PasswordBlocklist(path) if path and os.path.exists(path) else None
+    return _blocklist
+
+
+# Function to check a password against the built-in list and the breached password blocklist
+def is_common_password(password):
+    lowered = password.lower()
+    return lowered in COMMON_PASSWORDS or (_blocklist is not None and lowered in _blocklist)
+
+
+# Function to evaluate password strength
+def check_password_strength(password):
+    return score_password(password)[1]
+
+
+# Function to score a password, returns the number of criteria met and the strength label
+def score_password(password):
+    class_count, bits_per_char = MASK_SUMMARIES[_class_mask(password)]
+
+    # Count the number of conditions the password meets
+    score = class_count
+    if len(password) >= 8:
+        score += 1
+    if not is_common_password(password):  # Check against common and breached passwords
+        score += 1
+    if len(password) * bits_per_char >= 40:  # Entropy check, a reasonable threshold for randomness
+        score += 1
+
+    # Determine the strength based on score
+    return score, STRENGTHS.get(score, "Weak")
+
+
+# Function to analyze a password in detail, returns a dictionary that can be saved as JSON
+def analyze_password(password):
+    translated = password.translate(CLASS_TABLE)
+    class_count, bits_per_char = MASK_SUMMARIES[_class_mask(password, translated)]
+    length = len(password)
+    common = is_common_password(password)
+    score = class_count + (length >= 8) + (not common) + (length * bits_per_char >= 40)
+
+    # Character counts as passwordChecker.py reports them, where whitespace is its own group
+    # and anything that isn't an ASCII letter, digit or space is special
+    lower = translated.count("l")
+    upper = translated.count("u")
+    digits = translated.count("d")
+    whitespace = password.count(" ")
+    special = length - lower - upper - digits - whitespace
+    counts = (lower, upper, digits, whitespace, special)
+
+    return {
+        "length": length,
+        "lower": lower,
+        "upper": upper,
+        "digits": digits,
+        "whitespace": whitespace,
+        "special": special,
+        "variety": sum(1 for count in counts if count),
+        "entropy": round(length * bits_per_char, 2),
+        "common": common,
+        "score": score,
+        "strength": STRENGTHS.get(score, "Weak"),
+    }
+
+
+# Function to calculate the entropy of the password
+def calculate_entropy(password):
+    return entropy_from_classes(len(password), classify_password(password))
+
+
+# Function to calculate entropy from a password length and the classes found by classify_password
+def entropy_from_classes(length, classes):
+    # Total possible characters for the password
+    possible_characters = sum(CLASS_POOL_SIZES[name] for name in classes)
+
+    # Calculate entropy: entropy = log2(possible_characters^length)
+    return length * math.log2(possible_characters) if possible_characters > 0 else 0
+
+
+# Same scoring as score_password, unrolled into one loop with local lookups because this is the hot path for big lists
+def _score_batch(passwords):
+    class_mask = _class_mask
+    summaries = MASK_SUMMARIES
+    is_common = is_common_password
+    strengths = STRENGTHS
+    results = []
+    for password in passwords:
+        class_count, bits_per_char = summaries[class_mask(password)]
+        length = len(password)
+        score = class_count + (length >= 8) + (not is_common(password)) + (length * bits_per_char >= 40)
+        results.append(strengths.get(score, "Weak"))
+    return results
+
+
+def _analyze_batch(passwords):
+    return [analyze_password(password) for password in passwords]
+
+
+def _batches(passwords, size):
+    batch = []
+    for password in passwords:
+        batch.append(password)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Function to score many passwords, yields (password, strength) pairs in the original order,
+# or (password, analyze_password result) pairs if detailed is True
+def score_passwords(passwords, workers=1, batch_size=BATCH_SIZE, detailed=False):
+    score_batch = _analyze_batch if detailed else _score_batch
+    if workers == 1:
+        for batch in _batches(passwords, batch_size):
+            yield from zip(batch, score_batch(batch))
+        return
+
+    # Only keep a few batches in flight per worker so huge inputs are never held in memory at once
+    # Workers open the same blocklist themselves, an mmap can't be sent between processes
+    blocklist_path = _blocklist.path if _blocklist is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_blocklist, initargs=(blocklist_path,)) as executor:
+        max_in_flight = (workers or os.cpu_count() or 1) * 2
+        pending = deque()
+        for batch in _batches(passwords, batch_size):
+            pending.append((batch, executor.submit(score_batch, batch)))
+            if len(pending) >= max_in_flight:
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from zip(batch, future.result())
+
+
+# Function to score every password in a file with one password per line
+def score_password_file(file_path, workers=1, batch_size=BATCH_SIZE, detailed=False):
+    with open(file_path, "r", encoding="utf-8", errors=ENCODING_ERRORS) as file:
+        yield from score_password_lines(file, workers, batch_size, detailed)
+
+
+# Function to score passwords from any open text stream with one password per line, such as sys.stdin
+def score_password_lines(lines, workers=1, batch_size=BATCH_SIZE, detailed=False):
+    passwords = (line.rstrip("\r\n") for line in lines)
+    yield from score_passwords(passwords, workers, batch_size, detailed)
+
+
+load_blocklist()
+
+
+# Function for argparse that only accepts whole numbers of 1 or more
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+# Command line mode: streams passwords line by line and writes one JSON result per line
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score passwords from a file or stdin (one per line) and print JSON Lines results."
+    )
+    parser.add_argument("file", nargs="?", default="-", help="Password file, or - for stdin (default)")
+    parser.add_argument("--workers", type=positive_int, default=1, help="Number of processes to score with (default 1)")
+    parser.add_argument("--blocklist", help="Compiled breached password blocklist to check against")
+    parser.add_argument("--hide-passwords", action="store_true", help="Leave the passwords out of the output")
+    args = parser.parse_args()
+
+    if args.blocklist:
+        load_blocklist(args.blocklist)
+
+    if args.file == "-":
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors=ENCODING_ERRORS)
+        results = score_password_lines(stdin, args.workers, detailed=True)
+    else:
+        results = score_password_file(args.file, args.workers, detailed=True)
+
+    write = sys.stdout.write
+    for line_number, (password, result) in enumerate(results, start=1):
+        result = {"line": line_number, **result}
+        if not args.hide_passwords:
+            result["password"] = password
+        write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
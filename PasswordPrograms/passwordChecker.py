@@ -1,71 +1,48 @@
-import string
 import getpass
 
+from PasswordStrength import analyze_password
 
-def check_password_strength():
-   password = getpass.getpass('Enter the password (This will not show your password, just type it in and press enter): ')
-   strength = 0
-   remarks = ''
-   lower_count = upper_count = num_count = wspace_count = special_count = 0
+REMARKS = {
+   0: 'You didn\'t enter a password.',
+   1: ('That\'s a very bad password.'
+       ' Change it as soon as possible.'),
+   2: ('That\'s a weak password.'
+       ' You should consider using a tougher password.'),
+   3: 'Your password is okay, but it can be improved.',
+   4: ('Your password is hard to guess.'
+       ' But you could make it even more secure.'),
+   5: ('Now that\'s a great password!'
+       ' Hackers don\'t have a chance guessing that password!'),
+}
 
-   for char in list(password):
-       if char in string.ascii_lowercase:
-           lower_count += 1
-       elif char in string.ascii_uppercase:
-           upper_count += 1
-       elif char in string.digits:
-           num_count += 1
-       elif char == ' ':
-           wspace_count += 1
-       else:
-           special_count += 1
 
-   if lower_count >= 1:
-       strength += 1
-   if upper_count >= 1:
-       strength += 1
-   if num_count >= 1:
-       strength += 1
-   if wspace_count >= 1:
-       strength += 1
-   if special_count >= 1:
-       strength += 1
+def check_password_strength(password=None):
+   if password is None:
+       password = getpass.getpass('Enter the password (This will not show your password, just type it in and press enter): ')
+   result = analyze_password(password)
+   result['remarks'] = REMARKS[result['variety']]
+   return result
 
-   if strength == 1:
-       remarks = ('That\'s a very bad password.'
-           ' Change it as soon as possible.')
-   elif strength == 2:
-       remarks = ('That\'s a weak password.'
-           ' You should consider using a tougher password.')
-   elif strength == 3:
-       remarks = 'Your password is okay, but it can be improved.'
-   elif strength == 4:
-       remarks = ('Your password is hard to guess.'
-           ' But you could make it even more secure.')
-   elif strength == 5:
-       remarks = ('Now that\'s a great password!'
-           ' Hackers don\'t have a chance guessing that password!')
 
+def print_password_strength(result):
    print('Your password has:-')
-   print(f'{lower_count} lowercase letters')
-   print(f'{upper_count} uppercase letters')
-   print(f'{num_count} digits')
-   print(f'{wspace_count} whitespaces')
-   print(f'{special_count} special characters')
-   print(f'Password Score: {strength / 5}')
-   print(f'Remarks: {remarks}')
+   print(f'{result["lower"]} lowercase letters')
+   print(f'{result["upper"]} uppercase letters')
+   print(f'{result["digits"]} digits')
+   print(f'{result["whitespace"]} whitespaces')
+   print(f'{result["special"]} special characters')
+   print(f'Password Score: {result["variety"] / 5}')
+   print(f'Remarks: {result["remarks"]}')
 
 
 def check_pwd(another_pw=False):
-   valid = False
    if another_pw:
-       choice = input(
-           'Do you want to check another password\'s strength (y/n) : ')
+       question = 'Do you want to check another password\'s strength (y/n) : '
    else:
-       choice = input(
-           'Do you want to check your password\'s strength (y/n) : ')
+       question = 'Do you want to check your password\'s strength (y/n) : '
 
-   while not valid:
+   while True:
+       choice = input(question)
        if choice.lower() == 'y':
            return True
        elif choice.lower() == 'n':
@@ -79,5 +56,5 @@ if __name__ == '__main__':
    print('===== Welcome to Password Strength Checker =====')
    check_pw = check_pwd()
    while check_pw:
-       check_password_strength()
+       print_password_strength(check_password_strength())
        check_pw = check_pwd(True)
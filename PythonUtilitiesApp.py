@@ -2,7 +2,8 @@ import requests
 import os
 import winshell
 from win32com.client import Dispatch
-from tqdm import tqdm
+
+from Updater.FileLocator import locate
 
 GITHUB_API_URL = "https://api.github.com/repos/Stari-Div/Python-Utilities/releases/latest"
 
@@ -17,20 +18,15 @@ def get_latest_release_tag_name():
     return tag_name
 
 def find_folder_with_tag_name(tag_name, search_path):
-    """Search for a folder with 'Python-Utilities-' followed by the tag name in its name within the given directory."""
-    search_for = f"Python-Utilities-{tag_name}"
-    for root, dirs, files in tqdm(os.walk(search_path), desc="Searching for folder", unit="dir"):
-        for dir_name in dirs:
-            if search_for in dir_name:
-                return os.path.join(root, dir_name)
-    return None
+    """Search for a folder with 'Python-Utilities-' followed by the tag name in its name within the given directory.
+    The usual places are checked first and the last location found is remembered."""
+    home = os.path.expanduser("~")
+    likely_dirs = [os.path.join(home, folder) for folder in ("Downloads", "Desktop", "Documents")] + [home]
+    return locate(f"Python-Utilities-{tag_name}", [search_path], kind="dir", partial=True, likely_dirs=likely_dirs)
 
 def find_file(filename, search_path):
-    """Search for a file in the given directory and subdirectories."""
-    for root, dirs, files in tqdm(os.walk(search_path), desc=f"Searching for {filename}", unit="file"):
-        if filename in files: 
-            return os.path.join(root, filename)
-    return None
+    """Search for a file in the given directory and subdirectories, nearest first."""
+    return locate(filename, [search_path])
 
 def create_shortcut(target_path, icon_path):
     """Delete any existing shortcut and create a new one on the desktop."""
@@ -0,0 +1,44 @@
+# Started ahead of time by CentralUI so a utility can run the moment it is picked instead of waiting
+# for a new interpreter to start. Imports the heavy modules the utilities use while it waits, then
+# reads one JSON line on stdin naming the script and runs it as __main__ exactly as `python script.py`
+# would. Anything after that line is the script's input.
+import importlib
+import importlib.util
+import json
+import os
+import runpy
+import sys
+
+# Slow to import and used by several utilities. Ones that aren't installed are skipped
+PRELOAD_MODULES = ("numpy", "cv2", "psutil")
+
+
+def preload(modules=PRELOAD_MODULES):
+    for module in modules:
+        try:
+            if importlib.util.find_spec(module) is not None:
+                importlib.import_module(module)
+        except Exception:
+            # A broken install is the script's problem to report, not the launcher's
+            pass
+
+
+def run_script(request):
+    script_path = os.path.abspath(request["script"])
+    script_dir = os.path.dirname(script_path)
+    os.chdir(script_dir)
+    # Make the script's own folder the first place imports are looked for, like running it directly
+    sys.path[0] = script_dir
+    sys.argv = [script_path] + request.get("args", [])
+    runpy.run_path(script_path, run_name="__main__")
+
+
+def main():
+    preload()
+    line = sys.stdin.readline()
+    if line:
+        run_script(json.loads(line))
+
+
+if __name__ == "__main__":
+    main()
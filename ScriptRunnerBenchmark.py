@@ -0,0 +1,141 @@
+# Measures how long a utility takes to print its first line when it is launched as a new
+# subprocess, with QProcess, and through a launcher interpreter that was started in advance, then
+# how long the heavy imports take and what the warmed launchers save on the real utilities.
+# Usage: python ScriptRunnerBenchmark.py [runs]   (default: 10)
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QCoreApplication, QProcess
+
+from CentralUI import LAUNCHER_PATH
+from ScriptLauncher import PRELOAD_MODULES
+
+SCRIPT = "print('ready')\n"
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+UTILITIES = [
+    os.path.join(ROOT, "DetectionPrograms", "MotionDetection.py"),
+    os.path.join(ROOT, "DetectionPrograms", "FaceDetectionExperimental.py"),
+    os.path.join(ROOT, "SystemPrograms", "SystemInfo.py"),
+]
+
+# How long to let a launcher import everything before it is used, like the time spent picking a script
+WARM_UP_SECONDS = 3.0
+
+
+def cold_subprocess(script_path):
+    start = time.perf_counter()
+    with subprocess.Popen([sys.executable, "-u", script_path], stdout=subprocess.PIPE) as process:
+        process.stdout.readline()
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def wait_for_output(process, start):
+    while not process.waitForReadyRead(5000):
+        if process.state() == QProcess.NotRunning:
+            raise RuntimeError("The script stopped without printing anything")
+    elapsed = time.perf_counter() - start
+    process.waitForFinished(5000)
+    return elapsed
+
+
+def cold_qprocess(script_path):
+    process = QProcess()
+    start = time.perf_counter()
+    process.start(sys.executable, ["-u", script_path])
+    return wait_for_output(process, start)
+
+
+def warm_launcher(script_path, warm_up=0.5):
+    process = QProcess()
+    process.start(sys.executable, ["-u", LAUNCHER_PATH])
+    process.waitForStarted()
+    # Give it the time it would have had while the user was picking a script
+    time.sleep(warm_up)
+    start = time.perf_counter()
+    process.write((json.dumps({"script": script_path}) + "\n").encode())
+    return wait_for_output(process, start)
+
+
+def first_output(process, start):
+    # Utilities may wait for input after their first line, so stop them once it arrives
+    while not process.waitForReadyRead(10000):
+        if process.state() == QProcess.NotRunning:
+            break
+    elapsed = time.perf_counter() - start
+    process.kill()
+    process.waitForFinished(5000)
+    return elapsed
+
+
+def utility_cold(script_path):
+    process = QProcess()
+    process.setWorkingDirectory(os.path.dirname(script_path))
+    start = time.perf_counter()
+    process.start(sys.executable, ["-u", script_path])
+    return first_output(process, start)
+
+
+def utility_warm(script_path):
+    process = QProcess()
+    process.start(sys.executable, ["-u", LAUNCHER_PATH])
+    process.waitForStarted()
+    time.sleep(WARM_UP_SECONDS)
+    start = time.perf_counter()
+    process.write((json.dumps({"script": script_path}) + "\n").encode())
+    return first_output(process, start)
+
+
+def import_times(runs):
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+
+    baseline = statistics.median(run("pass") for _ in range(runs))
+    print(f"Import time in a new interpreter, median of {runs} runs (zero in a warmed launcher):")
+    for module in PRELOAD_MODULES:
+        elapsed = statistics.median(run(f"import {module}") for _ in range(runs)) - baseline
+        print(f"  {module:<16} {elapsed * 1000:8.1f} ms")
+
+
+def utility_benchmark(runs):
+    print(f"Utilities, time to first output, median of {runs} runs:")
+    print(f"  {'':<32} {'cold':>10} {'warm':>10}")
+    for script_path in UTILITIES:
+        cold = statistics.median(utility_cold(script_path) for _ in range(runs))
+        warm = statistics.median(utility_warm(script_path) for _ in range(runs))
+        print(f"  {os.path.basename(script_path):<32} {cold * 1000:7.1f} ms {warm * 1000:7.1f} ms")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    app = QCoreApplication(sys.argv)  # noqa: F841, QProcess expects an application to exist
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        script_path = os.path.join(work_dir, "hello.py")
+        with open(script_path, "w") as script:
+            script.write(SCRIPT)
+
+        print(f"Time to first output, median of {runs} runs:")
+        for name, launch in (
+            ("new subprocess", cold_subprocess),
+            ("QProcess", cold_qprocess),
+            ("warm launcher", warm_launcher),
+        ):
+            times = [launch(script_path) for _ in range(runs)]
+            print(f"  {name:<16} {statistics.median(times) * 1000:8.1f} ms")
+
+    import_times(runs)
+    # Each warm run waits for the launcher to finish importing, so use fewer runs
+    utility_benchmark(max(1, runs // 3))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,233 @@
-# This uses a rough estimate. If it isn't correct use the normal manual shift and start from 1 until you get words :)
+# This scores every possible shift against English letter and bigram frequencies.
+# Very short texts can still fool it, if it isn't correct use the normal manual shift and start from 1 until you get words :)
+import math
+import os
+import string
 from collections import Counter
 
-def get_shift(encrypted_text):
+from CeasarCipherEngine import shift_text
+from LetterHistogram import histogram_text
+
+# Relative frequency (percent) of each letter a-z in English text
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074
+]
+
+# Relative frequency (percent) of the most common English bigrams
+ENGLISH_BIGRAMS = {
+    "th": 3.56, "he": 3.07, "in": 2.43, "er": 2.05, "an": 1.99, "re": 1.85, "on": 1.76,
+    "at": 1.49, "en": 1.45, "nd": 1.35, "ti": 1.34, "es": 1.34, "or": 1.28, "te": 1.20,
+    "of": 1.17, "ed": 1.17, "is": 1.13, "it": 1.12, "al": 1.09, "ar": 1.07, "st": 1.05,
+    "to": 1.04, "nt": 1.04, "ng": 0.95, "se": 0.93, "ha": 0.93, "as": 0.87, "ou": 0.87,
+    "io": 0.83, "le": 0.83, "ve": 0.83, "co": 0.79, "me": 0.79, "de": 0.76, "hi": 0.76,
+    "ri": 0.73, "ro": 0.73, "ic": 0.70, "ne": 0.69, "ea": 0.69, "ra": 0.69, "ce": 0.65
+}
+
+# Any bigram not in the table above is treated as having this frequency
+BIGRAM_FLOOR = 0.1
+
+# Sampling defaults for huge texts and files
+SAMPLE_SIZE = 1024 * 1024
+SAMPLE_BLOCK_SIZE = 64 * 1024
+
+# Precomputed bonus for each common bigram, indexed by letter numbers
+_BIGRAM_BONUS = {
+    (ord(pair[0]) - 97, ord(pair[1]) - 97): math.log(frequency / BIGRAM_FLOOR)
+    for pair, frequency in ENGLISH_BIGRAMS.items()
+}
+
+
+def letter_histogram(text):
     """
-    Estimates the shift value used in Caesar Cipher by analyzing the most frequent letter.
-    
+    Counts how often each letter appears, ignoring case, spaces and punctuation, in one pass.
+
+    Args:
+    text (str): The text to count.
+
+    Returns:
+    list: 26 counts, one for each letter a-z.
+    """
+    return histogram_text(text).tolist()
+
+
+def bigram_histogram(text):
+    """
+    Counts every pair of neighbouring letters in the text, ignoring case.
+
+    Args:
+    text (str): The text to count.
+
+    Returns:
+    Counter: Counts keyed by (first, second) letter numbers from 0 to 25.
+    """
+    text = text.lower()
+    pairs = Counter(zip(text, text[1:]))
+    histogram = Counter()
+    for (first, second), count in pairs.items():
+        if first in string.ascii_lowercase and second in string.ascii_lowercase:
+            histogram[(ord(first) - 97, ord(second) - 97)] = count
+    return histogram
+
+
+def chi_squared(histogram, shift):
+    """
+    Measures how far the text decrypted with a shift is from normal English letter frequencies.
+
+    Args:
+    histogram (list): The 26 letter counts of the encrypted text.
+    shift (int): The shift to test.
+
+    Returns:
+    float: The chi-squared statistic. Lower means more English-like.
+    """
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+
+    score = 0.0
+    for letter, frequency in enumerate(ENGLISH_FREQUENCIES):
+        expected = total * frequency / 100
+        # The letter that decrypts to this one is found by rotating the histogram
+        observed = histogram[(letter + shift) % 26]
+        score += (observed - expected) ** 2 / expected
+    return score
+
+
+def bigram_bonus(bigrams, shift):
+    """
+    Rewards shifts whose decrypted text contains common English bigrams.
+
+    Args:
+    bigrams (Counter): The bigram counts of the encrypted text.
+    shift (int): The shift to test.
+
+    Returns:
+    float: The bonus. Higher means more English-like.
+    """
+    bonus = 0.0
+    for (first, second), count in bigrams.items():
+        bonus += count * _BIGRAM_BONUS.get(((first - shift) % 26, (second - shift) % 26), 0.0)
+    return bonus
+
+
+def score_shifts(histogram, bigrams=None):
+    """
+    Scores all 26 shifts. The histograms are only computed once and then rotated for each shift.
+
+    Args:
+    histogram (list): The 26 letter counts of the encrypted text.
+    bigrams (Counter): The bigram counts of the encrypted text, or None to only use letters.
+
+    Returns:
+    list: 26 scores, one per shift. Lower is better.
+    """
+    scores = []
+    for shift in range(26):
+        score = chi_squared(histogram, shift)
+        if bigrams:
+            score -= bigram_bonus(bigrams, shift)
+        scores.append(score)
+    return scores
+
+
+def _sample_offsets(size, sample_size, block_size):
+    # Where the evenly spaced blocks of a stride sample start
+    block_size = min(block_size, sample_size)
+    blocks = max(1, sample_size // block_size)
+    step = (size - block_size) // max(1, blocks - 1) if blocks > 1 else 0
+    return [index * step for index in range(blocks)], block_size
+
+
+def sample_text(text, sample_size=SAMPLE_SIZE, mode="prefix", block_size=SAMPLE_BLOCK_SIZE):
+    """
+    Takes a bounded sample of a long text, the same way read_sample does for files.
+
+    Args:
+    text (str): The text to sample.
+    sample_size (int): The most characters to keep, or None to keep the whole text.
+    mode (str): "prefix" keeps the start of the text, "stride" keeps evenly spaced blocks across it.
+    block_size (int): The size of each block in stride mode.
+
+    Returns:
+    str: The sampled text.
+    """
+    if sample_size is None or len(text) <= sample_size:
+        return text
+    if mode == "prefix":
+        return text[:sample_size]
+    if mode == "stride":
+        offsets, block_size = _sample_offsets(len(text), sample_size, block_size)
+        # Join with a space so no fake bigrams appear across block edges
+        return " ".join(text[offset:offset + block_size] for offset in offsets)
+    raise ValueError(f"Unknown sample mode: {mode}")
+
+
+def get_shift(encrypted_text, use_bigrams=True, sample_size=SAMPLE_SIZE, mode="prefix"):
+    """
+    Estimates the shift value used in Caesar Cipher by scoring every shift against English frequencies.
+    Long texts are scored from a bounded sample of them, see sample_text.
+
     Args:
     encrypted_text (str): The encrypted text to analyze.
-    
+    use_bigrams (bool): Whether to also score common letter pairs. Helps a lot on short texts.
+    sample_size (int): The most characters to score, or None to score the whole text.
+    mode (str): "prefix" or "stride", see sample_text.
+
     Returns:
     int: The estimated shift value.
     """
-    # Count the frequency of each letter in the encrypted text
-    frequency = Counter(encrypted_text)
-    
-    # Find the most common letter in the encrypted text
-    most_common_letter, _ = frequency.most_common(1)[0]
-    
-    # Assuming the most common letter should be 'E', calculate the shift
-    shift = (ord(most_common_letter) - ord('E')) % 26
-    
-    return shift
+    encrypted_text = sample_text(encrypted_text, sample_size, mode)
+    histogram = letter_histogram(encrypted_text)
+    # Bigrams matter most on short texts, so on long ones only the start is counted
+    bigrams = bigram_histogram(encrypted_text[:SAMPLE_SIZE]) if use_bigrams else None
+    scores = score_shifts(histogram, bigrams)
+    return scores.index(min(scores))
+
+
+def read_sample(file_path, sample_size=SAMPLE_SIZE, mode="prefix", block_size=SAMPLE_BLOCK_SIZE):
+    """
+    Reads a bounded sample of a file so huge files don't have to be scanned completely.
+
+    Args:
+    file_path (str): The file to sample.
+    sample_size (int): The most bytes to read in total.
+    mode (str): "prefix" reads the start of the file, "stride" reads evenly spaced blocks across it.
+    block_size (int): The size of each block in stride mode.
+
+    Returns:
+    str: The sampled text.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as file:
+        if mode == "prefix" or size <= sample_size:
+            data = file.read(sample_size)
+        elif mode == "stride":
+            offsets, block_size = _sample_offsets(size, sample_size, block_size)
+            parts = []
+            for offset in offsets:
+                file.seek(offset)
+                parts.append(file.read(block_size))
+            # Join with a space so no fake bigrams appear across block edges
+            data = b" ".join(parts)
+        else:
+            raise ValueError(f"Unknown sample mode: {mode}")
+    return data.decode("utf-8", errors="ignore")
+
+
+def get_shift_from_file(file_path, sample_size=SAMPLE_SIZE, mode="prefix"):
+    """
+    Estimates the shift value of an encrypted file from a bounded sample of it.
+
+    Args:
+    file_path (str): The encrypted file.
+    sample_size (int): The most bytes to read.
+    mode (str): "prefix" or "stride", see read_sample.
+
+    Returns:
+    int: The estimated shift value.
+    """
+    return get_shift(read_sample(file_path, sample_size, mode))
 
 def decrypt(text, shift):
     """
@@ -33,25 +240,7 @@ def decrypt(text, shift):
     Returns:
     str: The decrypted text.
     """
-    result = ""
-
-    # Traverse through the given text
-    for i in range(len(text)):
-        char = text[i]
-
-        # Decrypt uppercase characters
-        if char.isupper():
-            result += chr((ord(char) - shift - 65) % 26 + 65)
-
-        # Decrypt lowercase characters
-        elif char.islower():
-            result += chr((ord(char) - shift - 97) % 26 + 97)
-
-        # Leave non-alphabet characters unchanged
-        else:
-            result += char
-
-    return result
+    return shift_text(text, -shift)
 
 def main():
     print("Welcome to the Text Decrypter!")
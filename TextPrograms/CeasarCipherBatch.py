@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from CeasarCipherEngine import shift_file_range
+
+# Files bigger than this are split into several ranges so one huge file can use every core
+RANGE_SIZE = 64 * 1024 * 1024
+
+
+def _process_range(input_path, output_path, shift, offset, length):
+    start = time.perf_counter()
+    processed = shift_file_range(input_path, output_path, shift, offset, length)
+    return input_path, processed, time.perf_counter() - start
+
+
+def collect_files(input_dir, output_dir=None):
+    """
+    Walks a directory and pairs every file with the path its result should be written to.
+
+    Args:
+    input_dir (str): The directory to walk.
+    output_dir (str): The mirror directory to write to. If None, files are changed in place.
+
+    Returns:
+    list: (input_path, output_path) tuples.
+    """
+    input_dir = os.path.abspath(input_dir)
+    output_dir = os.path.abspath(output_dir) if output_dir else None
+    pairs = []
+
+    for root, dirs, files in os.walk(input_dir):
+        # Never walk into the mirror tree if it lives inside the input directory
+        if output_dir:
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != output_dir]
+
+        for file_name in files:
+            input_path = os.path.join(root, file_name)
+            if output_dir:
+                output_path = os.path.join(output_dir, os.path.relpath(input_path, input_dir))
+            else:
+                output_path = input_path
+            pairs.append((input_path, output_path))
+
+    return pairs
+
+
+def split_ranges(size, range_size=RANGE_SIZE):
+    """
+    Splits a file size into (offset, length) ranges of at most range_size bytes.
+
+    Args:
+    size (int): The size of the file.
+    range_size (int): The largest range to hand to one worker.
+
+    Returns:
+    list: (offset, length) tuples. An empty file gives an empty list.
+    """
+    return [(offset, min(range_size, size - offset)) for offset in range(0, size, range_size)]
+
+
+def process_directory(input_dir, shift, output_dir=None, workers=None, range_size=RANGE_SIZE):
+    """
+    Encrypts or decrypts every file in a directory tree using a process pool.
+
+    Args:
+    input_dir (str): The directory to process.
+    shift (int): The number of positions to shift each letter. Use a negative shift to decrypt.
+    output_dir (str): The mirror directory to write to. If None, files are changed in place.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    range_size (int): The largest piece of a file to hand to one worker.
+
+    Returns:
+    dict: Per-file results and aggregate totals.
+    """
+    pairs = collect_files(input_dir, output_dir)
+    results = {}
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for input_path, output_path in pairs:
+            size = os.path.getsize(input_path)
+            results[input_path] = {"output": output_path, "bytes": 0, "seconds": 0.0}
+
+            # Size the output up front so every worker can write its own range
+            if output_path != input_path:
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                with open(output_path, "wb") as file:
+                    file.truncate(size)
+
+            for offset, length in split_ranges(size, range_size):
+                futures.append(executor.submit(
+                    _process_range, input_path, output_path, shift, offset, length
+                ))
+
+        for future in as_completed(futures):
+            input_path, processed, seconds = future.result()
+            results[input_path]["bytes"] += processed
+            results[input_path]["seconds"] += seconds
+    elapsed = time.perf_counter() - start
+
+    total = sum(result["bytes"] for result in results.values())
+    return {
+        "files": results,
+        "total_bytes": total,
+        "seconds": elapsed,
+        "mb_per_second": total / elapsed / 1e6 if elapsed else 0.0,
+    }
+
+
+def main():
+    print("Welcome to the Batch Text Encrypter!")
+    input_dir = input("Enter the folder to encrypt or decrypt: ")
+    shift = int(input("Enter the shift value (use a negative number to decrypt): "))
+    output_dir = input("Enter a folder to write the results to (leave blank to change files in place): ")
+
+    summary = process_directory(input_dir, shift, output_dir or None)
+
+    for input_path, result in summary["files"].items():
+        rate = result["bytes"] / result["seconds"] / 1e6 if result["seconds"] else 0.0
+        print(f"{input_path} -> {result['output']}: {result['bytes']} bytes, {rate:.1f} MB/s")
+    print(f"Processed {summary['total_bytes']} bytes in {len(summary['files'])} files "
+          f"in {summary['seconds']:.2f} s ({summary['mb_per_second']:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Compares the old character-by-character cipher loop with the table-driven engine.
+# Usage: python CeasarCipherBenchmark.py [sizes in MB...]   (default: 1 100 1024)
+import os
+import sys
+import tempfile
+import time
+
+from CeasarCipherEngine import shift_file, shift_text
+
+SAMPLE = "The quick brown fox jumps over the lazy dog. 0123456789 LOG ENTRY: ok!\n"
+
+# The old loop is far too slow for the biggest inputs, so it is only timed up to this size
+LEGACY_LIMIT_MB = 100
+
+
+def legacy_encrypt(text, shift):
+    result = ""
+    for i in range(len(text)):
+        char = text[i]
+        if char.isupper():
+            result += chr((ord(char) + shift - 65) % 26 + 65)
+        elif char.islower():
+            result += chr((ord(char) + shift - 97) % 26 + 97)
+        else:
+            result += char
+    return result
+
+
+def write_sample_file(path, size):
+    block = (SAMPLE * (1024 * 1024 // len(SAMPLE) + 1)).encode()[:1024 * 1024]
+    with open(path, "wb") as file:
+        remaining = size
+        while remaining > 0:
+            file.write(block[:remaining])
+            remaining -= len(block)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def report(name, size, seconds):
+    print(f"  {name:<22} {seconds:8.3f} s  {size / seconds / 1e6:10.1f} MB/s")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 100, 1024]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size_mb in sizes:
+            size = size_mb * 1024 * 1024
+            input_path = os.path.join(work_dir, "input.txt")
+            output_path = os.path.join(work_dir, "output.txt")
+            write_sample_file(input_path, size)
+            print(f"{size_mb} MB input:")
+
+            if size_mb <= LEGACY_LIMIT_MB:
+                with open(input_path, "r") as file:
+                    text = file.read()
+                report("per-character loop", size, timed(legacy_encrypt, text, 3))
+                report("str.translate", size, timed(shift_text, text, 3))
+                del text
+            else:
+                print(f"  per-character loop     skipped (over {LEGACY_LIMIT_MB} MB)")
+
+            report("streamed file", size, timed(shift_file, input_path, output_path, 3))
+
+
+if __name__ == "__main__":
+    main()
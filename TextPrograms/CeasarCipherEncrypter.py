@@ -1,3 +1,6 @@
+from CeasarCipherEngine import shift_text
+
+
 def encrypt(text, shift):
     """
     Encrypts the input text using Caesar Cipher with the given shift.
@@ -9,25 +12,7 @@ def encrypt(text, shift):
     Returns:
     str: The encrypted text.
     """
-    result = ""
-
-    # Traverse through the given text
-    for i in range(len(text)):
-        char = text[i]
-
-        # Encrypt uppercase characters
-        if char.isupper():
-            result += chr((ord(char) + shift - 65) % 26 + 65)
-
-        # Encrypt lowercase characters
-        elif char.islower():
-            result += chr((ord(char) + shift - 97) % 26 + 97)
-
-        # Leave non-alphabet characters unchanged
-        else:
-            result += char
-
-    return result
+    return shift_text(text, shift)
 
 def main():
     print("Welcome to the Text Encrypter!")
@@ -0,0 +1,156 @@
+import os
+import string
+from functools import lru_cache
+
+# Files are processed in 1 MiB pieces so memory use stays flat no matter how big the input is
+CHUNK_SIZE = 1024 * 1024
+
+
+def _rotate(alphabet, shift):
+    shift %= 26
+    return alphabet[shift:] + alphabet[:shift]
+
+
+@lru_cache(maxsize=52)
+def build_table(shift):
+    """
+    Builds a str.translate table that shifts every ASCII letter by the given amount.
+
+    Args:
+    shift (int): The number of positions to shift each letter. Negative values shift back.
+
+    Returns:
+    dict: The translation table.
+    """
+    lower, upper = string.ascii_lowercase, string.ascii_uppercase
+    return str.maketrans(lower + upper, _rotate(lower, shift) + _rotate(upper, shift))
+
+
+@lru_cache(maxsize=52)
+def build_byte_table(shift):
+    """
+    Builds a bytes.translate table that shifts every ASCII letter by the given amount.
+
+    Args:
+    shift (int): The number of positions to shift each letter. Negative values shift back.
+
+    Returns:
+    bytes: The 256 byte translation table.
+    """
+    lower, upper = string.ascii_lowercase, string.ascii_uppercase
+    return bytes.maketrans(
+        (lower + upper).encode(),
+        (_rotate(lower, shift) + _rotate(upper, shift)).encode()
+    )
+
+
+def shift_text(text, shift):
+    """
+    Shifts the letters of a string with Caesar Cipher. Non-alphabet characters are left unchanged.
+
+    Args:
+    text (str): The text to shift.
+    shift (int): The number of positions to shift each letter. Use a negative shift to decrypt.
+
+    Returns:
+    str: The shifted text.
+    """
+    return text.translate(build_table(shift))
+
+
+def shift_bytes(data, shift):
+    """
+    Shifts the ASCII letters in a bytes object. Works on UTF-8 data because multi-byte
+    characters never contain ASCII bytes.
+
+    Args:
+    data (bytes): The data to shift.
+    shift (int): The number of positions to shift each letter. Use a negative shift to decrypt.
+
+    Returns:
+    bytes: The shifted data.
+    """
+    return data.translate(build_byte_table(shift))
+
+
+def shift_file(input_path, output_path, shift, chunk_size=CHUNK_SIZE):
+    """
+    Streams a file through the cipher in fixed-size chunks and writes the result to another file.
+
+    Args:
+    input_path (str): The file to read.
+    output_path (str): The file to write. Must not be the same file as input_path.
+    shift (int): The number of positions to shift each letter. Use a negative shift to decrypt.
+    chunk_size (int): How many bytes to read at a time.
+
+    Returns:
+    int: The number of bytes processed.
+    """
+    if os.path.abspath(input_path) == os.path.abspath(output_path):
+        raise ValueError("Input and output must be different files")
+
+    table = build_byte_table(shift)
+    total = 0
+
+    with open(input_path, "rb") as source, open(output_path, "wb") as target:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            target.write(chunk.translate(table))
+            total += len(chunk)
+
+    return total
+
+
+def shift_file_range(input_path, output_path, shift, offset, length, chunk_size=CHUNK_SIZE):
+    """
+    Shifts one byte range of a file and writes it to the same range of the output file.
+    The output file must already exist. Input and output may be the same file, in which
+    case the range is rewritten in place.
+
+    Args:
+    input_path (str): The file to read.
+    output_path (str): The file to write into.
+    shift (int): The number of positions to shift each letter. Use a negative shift to decrypt.
+    offset (int): Where the range starts.
+    length (int): How many bytes the range covers.
+    chunk_size (int): How many bytes to read at a time.
+
+    Returns:
+    int: The number of bytes processed.
+    """
+    table = build_byte_table(shift)
+    in_place = os.path.abspath(input_path) == os.path.abspath(output_path)
+    total = 0
+
+    with open(output_path, "r+b") as target:
+        source = target if in_place else open(input_path, "rb")
+        try:
+            while total < length:
+                source.seek(offset + total)
+                chunk = source.read(min(chunk_size, length - total))
+                if not chunk:
+                    break
+                target.seek(offset + total)
+                target.write(chunk.translate(table))
+                total += len(chunk)
+        finally:
+            if not in_place:
+                source.close()
+
+    return total
+
+
+def main():
+    print("Welcome to the File Encrypter!")
+    input_path = input("Enter the path of the file to encrypt or decrypt: ")
+    output_path = input("Enter the path to save the result to: ")
+    shift = int(input("Enter the shift value (use a negative number to decrypt): "))
+
+    total = shift_file(input_path, output_path, shift)
+    print(f"Processed {total} bytes into {output_path}")
+
+
+if __name__ == "__main__":
+    main()
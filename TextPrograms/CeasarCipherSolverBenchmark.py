@@ -0,0 +1,92 @@
+# Measures how often the auto shift solver gets the right answer and how fast it is.
+# Usage: python CeasarCipherSolverBenchmark.py
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from CeasarCipherAutoShiftExperimental import get_shift, get_shift_from_file
+from CeasarCipherEngine import shift_file, shift_text
+
+CORPUS = (
+    "It was a bright cold day in the middle of winter and the streets of the old town were quiet. "
+    "Most of the shops had closed early, and the few people still outside walked quickly with their "
+    "heads down against the wind. At the end of the road there was a small library where the light "
+    "was always on, and inside an old man was reading the newspaper by the window. He had worked there "
+    "for almost forty years and knew every book on every shelf. When the door opened he looked up and "
+    "smiled, because visitors were rare on evenings like this one. The young woman who came in was "
+    "looking for a history of the river and the bridges that had been built across it over the "
+    "centuries. Together they searched through the catalogue, then climbed the narrow stairs to the "
+    "second floor, where the records of the city council were kept in heavy leather volumes. "
+    "Programs that process log files often need to handle millions of lines, so the performance of "
+    "every function matters. A simple loop that looks harmless on a short sentence can take minutes "
+    "when the input is measured in gigabytes, which is why it is worth thinking about the algorithm "
+    "before writing the code. "
+)
+
+LENGTHS = [10, 25, 50, 100, 500, 5000]
+SAMPLES_PER_LENGTH = 200
+
+
+def legacy_get_shift(encrypted_text):
+    most_common_letter, _ = Counter(encrypted_text).most_common(1)[0]
+    return (ord(most_common_letter) - ord('E')) % 26
+
+
+def random_excerpt(rng, length):
+    text = CORPUS * (length // len(CORPUS) + 2)
+    start = rng.randrange(len(CORPUS))
+    return text[start:start + length]
+
+
+def accuracy_suite():
+    rng = random.Random(1234)
+    print(f"{'length':>8} {'legacy':>8} {'letters':>8} {'bigrams':>8}")
+    for length in LENGTHS:
+        correct = Counter()
+        for _ in range(SAMPLES_PER_LENGTH):
+            shift = rng.randrange(26)
+            ciphertext = shift_text(random_excerpt(rng, length), shift)
+            correct["legacy"] += legacy_get_shift(ciphertext) == shift
+            correct["letters"] += get_shift(ciphertext, use_bigrams=False) == shift
+            correct["bigrams"] += get_shift(ciphertext) == shift
+        print(f"{length:>8} " + " ".join(
+            f"{correct[name] / SAMPLES_PER_LENGTH:>8.1%}" for name in ("legacy", "letters", "bigrams")
+        ))
+
+
+def speed_suite(size_mb=100):
+    with tempfile.TemporaryDirectory() as work_dir:
+        plain_path = os.path.join(work_dir, "plain.txt")
+        cipher_path = os.path.join(work_dir, "cipher.txt")
+        with open(plain_path, "w") as file:
+            file.write(CORPUS * (size_mb * 1024 * 1024 // len(CORPUS)))
+        shift_file(plain_path, cipher_path, 11)
+
+        with open(cipher_path, "r") as file:
+            text = file.read()
+
+        for name, func in (
+            ("legacy, full text", lambda: legacy_get_shift(text)),
+            ("letters, full text", lambda: get_shift(text, use_bigrams=False, sample_size=None)),
+            ("bigrams, full text", lambda: get_shift(text, sample_size=None)),
+            ("in-memory prefix", lambda: get_shift(text)),
+            ("in-memory stride", lambda: get_shift(text, mode="stride")),
+            ("prefix sample", lambda: get_shift_from_file(cipher_path)),
+            ("stride sample", lambda: get_shift_from_file(cipher_path, mode="stride")),
+        ):
+            start = time.perf_counter()
+            shift = func()
+            print(f"  {name:<20} {time.perf_counter() - start:8.3f} s  shift={shift}")
+
+
+def main():
+    print("Accuracy over generated ciphertexts:")
+    accuracy_suite()
+    print("Speed on a 100 MB ciphertext (correct shift is 11):")
+    speed_suite()
+
+
+if __name__ == "__main__":
+    main()
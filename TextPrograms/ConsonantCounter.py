@@ -1,11 +1,7 @@
-word = input("Enter the text you would like to check: ")
-
-consonants = "bcdfghjklmnpqrstvwxyz"
+from LetterHistogram import count_consonants, histogram_text
 
-count=0
+word = input("Enter the text you would like to check: ")
 
-for letter in word:
-    if letter in consonants:
-        count = count + 1
+count = count_consonants(histogram_text(word))
 
 print("There are",count, "consonants in the word" ,word)
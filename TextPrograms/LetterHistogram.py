@@ -0,0 +1,138 @@
+import mmap
+import os
+import string
+
+import numpy as np
+
+VOWELS = "aeiou"
+CONSONANTS = "bcdfghjklmnpqrstvwxyz"
+
+# Files up to this size are read in one go, bigger ones are memory-mapped and counted in pieces of this size
+CHUNK_SIZE = 64 * 1024 * 1024
+
+_LOWER = np.frombuffer(string.ascii_lowercase.encode(), dtype=np.uint8)
+_UPPER = np.frombuffer(string.ascii_uppercase.encode(), dtype=np.uint8)
+_VOWEL_INDEXES = [string.ascii_lowercase.index(letter) for letter in VOWELS]
+_CONSONANT_INDEXES = [string.ascii_lowercase.index(letter) for letter in CONSONANTS]
+
+
+def _fold(byte_counts):
+    # Add the uppercase counts onto the lowercase ones
+    return byte_counts[_LOWER] + byte_counts[_UPPER]
+
+
+def _byte_counts(data):
+    return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+
+
+def histogram_bytes(data):
+    """
+    Counts each letter a-z in a bytes-like object, ignoring case.
+
+    Args:
+    data (bytes): The data to count. Anything supporting the buffer protocol works.
+
+    Returns:
+    numpy.ndarray: 26 counts, one for each letter a-z.
+    """
+    return _fold(_byte_counts(data))
+
+
+def histogram_text(text):
+    """
+    Counts each letter a-z in a string, ignoring case.
+
+    Args:
+    text (str): The text to count.
+
+    Returns:
+    numpy.ndarray: 26 counts, one for each letter a-z.
+    """
+    return histogram_bytes(text.encode("utf-8"))
+
+
+def histogram_file(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Counts each letter a-z in a file, ignoring case. Files up to chunk_size are read in one go,
+    bigger ones are memory-mapped and counted in chunks so memory use stays bounded.
+
+    Args:
+    file_path (str | os.PathLike): The file to count.
+    chunk_size (int): How many bytes to count at a time.
+
+    Returns:
+    numpy.ndarray: 26 counts, one for each letter a-z.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= chunk_size:
+            return histogram_bytes(file.read())
+
+        byte_counts = np.zeros(256, dtype=np.int64)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, size, chunk_size):
+                chunk = np.frombuffer(mapped, dtype=np.uint8, count=min(chunk_size, size - start), offset=start)
+                byte_counts += np.bincount(chunk, minlength=256)
+                # The map can't be closed while an array still points into it
+                del chunk
+    return _fold(byte_counts)
+
+
+def histogram(source):
+    """
+    Counts each letter a-z in a string, bytes object or file, ignoring case.
+
+    A str is ALWAYS counted as text, even when it looks like a file path: histogram("notes.txt")
+    counts the letters of "notes.txt". To count a file, pass a path object such as
+    pathlib.Path("notes.txt"), or call histogram_file.
+
+    Args:
+    source (str | bytes | os.PathLike): Text, raw bytes, or a path object pointing at a file.
+
+    Returns:
+    numpy.ndarray: 26 counts, one for each letter a-z.
+    """
+    if isinstance(source, os.PathLike):
+        return histogram_file(source)
+    if isinstance(source, str):
+        return histogram_text(source)
+    return histogram_bytes(source)
+
+
+def count_vowels(counts):
+    """
+    Totals the vowels in a letter histogram.
+
+    Args:
+    counts (numpy.ndarray): 26 letter counts from one of the histogram functions.
+
+    Returns:
+    int: The number of vowels.
+    """
+    return int(counts[_VOWEL_INDEXES].sum())
+
+
+def count_consonants(counts):
+    """
+    Totals the consonants in a letter histogram.
+
+    Args:
+    counts (numpy.ndarray): 26 letter counts from one of the histogram functions.
+
+    Returns:
+    int: The number of consonants.
+    """
+    return int(counts[_CONSONANT_INDEXES].sum())
+
+
+def letter_counts(counts):
+    """
+    Turns a letter histogram into a dictionary, leaving out letters that never appear.
+
+    Args:
+    counts (numpy.ndarray): 26 letter counts from one of the histogram functions.
+
+    Returns:
+    dict: Counts keyed by lowercase letter.
+    """
+    return {letter: int(count) for letter, count in zip(string.ascii_lowercase, counts) if count}
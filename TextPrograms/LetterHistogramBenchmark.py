@@ -0,0 +1,57 @@
+# Compares the old vowel/consonant loops with the NumPy histogram engine.
+# Usage: python LetterHistogramBenchmark.py [size in MB]   (default: 100)
+import os
+import sys
+import tempfile
+import time
+
+from LetterHistogram import count_consonants, count_vowels, histogram_file, histogram_text
+
+SAMPLE = "The Quick Brown Fox jumps over the lazy dog, again and again! 42\n"
+
+
+def legacy_count(word, letters):
+    count = 0
+    for letter in word:
+        if letter in letters:
+            count = count + 1
+    return count
+
+
+def timed(name, size, func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f"  {name:<30} {seconds:8.3f} s  {size / seconds / 1e6:10.1f} MB/s  -> {result}")
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    text = SAMPLE * (size_mb * 1024 * 1024 // len(SAMPLE))
+    size = len(text)
+    print(f"{size_mb} MB of text:")
+
+    # The old loops only looked at lowercase letters, so they are fed lowercase text
+    lower = text.lower()
+    timed("legacy vowel + consonant loops", size,
+          lambda: (legacy_count(lower, "aeiou"), legacy_count(lower, "bcdfghjklmnpqrstvwxyz")))
+    del lower
+
+    def from_text():
+        counts = histogram_text(text)
+        return count_vowels(counts), count_consonants(counts)
+    timed("histogram_text", size, from_text)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "sample.txt")
+        with open(path, "w") as file:
+            file.write(text)
+
+        def from_file():
+            counts = histogram_file(path)
+            return count_vowels(counts), count_consonants(counts)
+        timed("histogram_file (memory-mapped)", size, from_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,7 @@
-word = input("Enter the text you would like to check: ")
-
-vowels = "aeiou"
+from LetterHistogram import count_vowels, histogram_text
 
-count=0
+word = input("Enter the text you would like to check: ")
 
-for letter in word:
-    if letter in vowels:
-        count = count + 1
+count = count_vowels(histogram_text(word))
 
 print("There are ",count, "vowels in the word" ,word)
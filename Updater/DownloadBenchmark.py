@@ -0,0 +1,147 @@
+# Serves a large file from a local HTTP server that drops the connection part way through, and
+# compares the old read-everything download with the streaming, resumable one, including servers
+# that don't send a Content-Length, as with GitHub's chunked zipballs.
+# Usage: python DownloadBenchmark.py [file size in MB] [connection drops]   (default: 200 3)
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Updater import download_file
+
+
+class FlakyFileHandler(BaseHTTPRequestHandler):
+    """
+    Serves server.data with Range support. While server.drops_left is above zero, each response
+    is cut off after server.drop_after bytes. Without server.lengths no Content-Length is sent, so
+    the body simply ends when the connection closes.
+    """
+
+    def do_GET(self):
+        data = self.server.data
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.server.ranges:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        if self.server.lengths:
+            self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+
+        end = len(data)
+        if self.server.drops_left > 0:
+            self.server.drops_left -= 1
+            end = min(end, start + self.server.drop_after)
+        view = memoryview(data)
+        for offset in range(start, end, 1024 * 1024):
+            self.wfile.write(view[offset:min(offset + 1024 * 1024, end)])
+        if end < len(data):
+            # Cut the connection off without finishing the body
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(data, drops=0, drop_after=0, ranges=True, lengths=True):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyFileHandler)
+    server.data = data
+    server.drops_left = drops
+    server.drop_after = drop_after
+    server.ranges = ranges
+    server.lengths = lengths
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/release.zip"
+
+
+def legacy_download(download_url, download_dir, file_name):
+    file_path = os.path.join(download_dir, file_name)
+    with urllib.request.urlopen(download_url) as response, open(file_path, "wb") as file:
+        file.write(response.read())
+    return file_path
+
+
+def measure(name, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        result = None
+        print(f"  failed: {e}")
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {name:<34} {elapsed:6.2f} s, peak memory {peak / 1e6:7.1f} MB, "
+          f"{'ok' if result else 'FAILED'}")
+    return result
+
+
+def main():
+    size_mb, drops = (int(arg) for arg in (sys.argv[1:] + ["200", "3"][len(sys.argv) - 1:]))
+    data = os.urandom(size_mb * 1024 * 1024)
+    sha256 = hashlib.sha256(data).hexdigest()
+    print(f"Serving {size_mb} MB locally")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        server, url = start_server(data)
+        print("Steady connection:")
+        measure("legacy, whole file in memory", legacy_download, url, work_dir, "legacy.zip")
+        measure("streamed", download_file, url, work_dir, "streamed.zip", sha256)
+        server.shutdown()
+
+        server, url = start_server(data, drops, len(data) // (drops + 2))
+        print(f"Connection dropped {drops} times:")
+        path = measure("streamed with resume", download_file, url, work_dir, "resumed.zip", sha256)
+        if path:
+            print(f"  resumed file matches: {hashlib.sha256(open(path, 'rb').read()).hexdigest() == sha256}")
+        server.shutdown()
+
+        server, url = start_server(data, 1, len(data) // 3, ranges=False)
+        print("Connection dropped once, server without Range support:")
+        measure("streamed, restarted", download_file, url, work_dir, "restarted.zip", sha256)
+        server.shutdown()
+
+        server, url = start_server(data, drops, len(data) // (drops + 2), lengths=False)
+        print(f"Connection dropped {drops} times, no Content-Length:")
+        measure("streamed, checked by SHA-256", download_file, url, work_dir, "unsized.zip", sha256)
+        server.shutdown()
+
+        # Like a GitHub zipball: a real zip, no Content-Length, no Range support and no checksum
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_ref:
+            zip_ref.writestr("release/data.bin", data)
+        zip_data = zip_buffer.getvalue()
+        print("Zip without Content-Length, Range support or checksum, connection dropped once:")
+        server, url = start_server(zip_data, 1, len(zip_data) // 3, ranges=False, lengths=False)
+        measure("streamed, checked as a zip", download_file, url, work_dir, "zipball.zip", None, 1)
+        server.shutdown()
+        server, url = start_server(zip_data, 1, len(zip_data) // 3, ranges=False, lengths=False)
+        measure("same, no retries left", download_file, url, work_dir, "truncated.zip", None, 0)
+        print(f"  truncated zip not put in place: {not os.path.exists(os.path.join(work_dir, 'truncated.zip'))}")
+        server.shutdown()
+
+        server, url = start_server(data)
+        print("Wrong checksum:")
+        measure("streamed", download_file, url, work_dir, "corrupt.zip", "0" * 64)
+        print(f"  nothing left behind: {not os.path.exists(os.path.join(work_dir, 'corrupt.zip.part'))}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import json
+import os
+from collections import deque
+
+# Remembers where things were found last time, next to the release cache
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".python_utilities", "locations.json")
+
+# How many folders deep a search goes below each root
+MAX_DEPTH = 6
+
+# Folders that never hold the release and are huge, compared in lower case
+PRUNED_DIRS = {
+    "windows", "program files", "program files (x86)", "programdata", "$recycle.bin", "system volume information",
+    "appdata", "node_modules", "site-packages", "__pycache__", ".git", ".cache", "venv", ".venv", "proc",
+}
+
+
+def load_index(index_path=INDEX_PATH):
+    try:
+        with open(index_path, "r") as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(index, index_path=INDEX_PATH):
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as index_file:
+            json.dump(index, index_file, indent=4)
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        print(f"Could not save the location index: {e}")
+
+
+def _matcher(name, partial):
+    if partial:
+        return lambda entry_name: name in entry_name
+    return lambda entry_name: entry_name == name
+
+
+def _is_kind(path, kind):
+    return os.path.isdir(path) if kind == "dir" else os.path.isfile(path)
+
+
+def search(roots, matches, kind="file", max_depth=MAX_DEPTH, pruned=PRUNED_DIRS):
+    """
+    Searches breadth first, so the match closest to a root is found first and the search stops
+    there. Folders in pruned, hidden folders and symbolic links are not entered.
+
+    Args:
+    roots (list): The folders to search, in order.
+    matches (callable): Takes a file or folder name and returns True if it is the one wanted.
+    kind (str): "file" or "dir".
+    max_depth (int): How many folders deep to go below each root.
+    pruned (set): Lower case folder names to skip.
+
+    Returns:
+    str: The path found, or None.
+    """
+    queue = deque((root, 0) for root in roots if os.path.isdir(root))
+    while queue:
+        folder, depth = queue.popleft()
+        try:
+            with os.scandir(folder) as entries:
+                entries = list(entries)
+        except OSError:
+            # No permission, or it disappeared while searching
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if matches(entry.name) and (is_dir if kind == "dir" else entry.is_file()):
+                    return entry.path
+            except OSError:
+                continue
+            if is_dir and depth < max_depth and entry.name.lower() not in pruned and not entry.name.startswith("."):
+                queue.append((entry.path, depth + 1))
+    return None
+
+
+def locate(name, roots, kind="file", partial=False, likely_dirs=(), max_depth=MAX_DEPTH,
+           index_path=INDEX_PATH, use_index=True):
+    """
+    Finds a file or folder, trying the quickest places first: where it was found last time,
+    then directly inside likely_dirs, then a depth limited breadth first search of roots.
+
+    Args:
+    name (str): The file or folder name.
+    roots (list): The folders to search.
+    kind (str): "file" or "dir".
+    partial (bool): Match any name containing name instead of only the exact name.
+    likely_dirs (list): Folders to look in first, only their direct contents are checked.
+    max_depth (int): How many folders deep to go below each root.
+    index_path (str): The index of previously found locations.
+    use_index (bool): Whether to read and update the index.
+
+    Returns:
+    str: The path found, or None.
+    """
+    matches = _matcher(name, partial)
+    key = f"{kind}:{name}:{'|'.join(os.path.abspath(root) for root in roots)}"
+    index = load_index(index_path) if use_index else {}
+
+    # Only trust the index if the path is still there and still what we are looking for
+    path = index.get(key)
+    if path and _is_kind(path, kind) and matches(os.path.basename(path)):
+        return path
+
+    path = search(likely_dirs, matches, kind, max_depth=0) or search(roots, matches, kind, max_depth)
+    if path and use_index:
+        index[key] = path
+        save_index(index, index_path)
+    return path
@@ -0,0 +1,79 @@
+# Builds a synthetic drive with a deep directory tree and compares the old os.walk searches with
+# the bounded breadth first locator, cold and with its index warm.
+# Usage: python FileLocatorBenchmark.py [folders per level] [levels]   (default: 6 5)
+import os
+import sys
+import tempfile
+import time
+
+from FileLocator import locate
+
+
+def make_tree(root, width=6, levels=5):
+    """
+    Makes a tree that looks roughly like a drive: deep folders of clutter, a big AppData style folder
+    of tooling, and the release in the user's Downloads. Returns how many folders were made.
+    """
+    made = 0
+    frontier = [os.path.join(root, "Data"), os.path.join(root, "Users", "me", "AppData", "Local")]
+    for level in range(levels):
+        next_frontier = []
+        for folder in frontier:
+            for index in range(width):
+                path = os.path.join(folder, f"dir{level}_{index}")
+                os.makedirs(path)
+                open(os.path.join(path, "file.txt"), "w").close()
+                next_frontier.append(path)
+                made += 1
+        frontier = next_frontier
+
+    release = os.path.join(root, "Users", "me", "Downloads", "Python-Utilities-v1.0")
+    os.makedirs(os.path.join(release, "Images"))
+    open(os.path.join(release, "CentralUI.py"), "w").close()
+    open(os.path.join(release, "Images", "PyUtilitiesIcon.ico"), "w").close()
+    return made
+
+
+def legacy_find_folder(search_for, search_path):
+    for root, dirs, files in os.walk(search_path):
+        for dir_name in dirs:
+            if search_for in dir_name:
+                return os.path.join(root, dir_name)
+    return None
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    width, levels = (int(arg) for arg in (sys.argv[1:] + ["6", "5"][len(sys.argv) - 1:]))
+
+    with tempfile.TemporaryDirectory() as drive:
+        folders = make_tree(drive, width, levels)
+        index_path = os.path.join(drive, "locations.json")
+        home = os.path.join(drive, "Users", "me")
+        print(f"Synthetic drive with {folders} folders")
+
+        elapsed, found = timed(legacy_find_folder, "Python-Utilities-v1.0", drive)
+        print(f"  {'os.walk of the whole drive':<34} {elapsed:9.1f} ms  found: {found is not None}")
+
+        for label, likely_dirs in (("breadth first, pruned", ()), ("likely folders first", [os.path.join(home, "Downloads")])):
+            elapsed, found = timed(locate, "Python-Utilities-v1.0", [drive], kind="dir", partial=True,
+                                   likely_dirs=likely_dirs, use_index=False)
+            print(f"  {label:<34} {elapsed:9.1f} ms  found: {found is not None}")
+
+        timed(locate, "Python-Utilities-v1.0", [drive], kind="dir", partial=True, index_path=index_path)
+        elapsed, found = timed(locate, "Python-Utilities-v1.0", [drive], kind="dir", partial=True, index_path=index_path)
+        print(f"  {'indexed, second run':<34} {elapsed:9.1f} ms  found: {found is not None}")
+
+        # The icon search inside the release, which used to be a full os.walk too
+        release = found
+        elapsed, found = timed(locate, "PyUtilitiesIcon.ico", [release], use_index=False)
+        print(f"  {'icon inside the release':<34} {elapsed:9.1f} ms  found: {found is not None}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import importlib.metadata
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+# Lists the pip packages each part of the project needs
+REQUIREMENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "requirements.json")
+
+# Packages that only install on Windows
+WINDOWS_ONLY = {"winshell", "pywin32"}
+
+# Packages whose import name doesn't follow from the pip name
+IMPORT_NAMES = {
+    "opencv-python": "cv2",
+    "pywin32": "win32com",
+    "speedtest-cli": "speedtest",
+}
+
+
+def load_requirements(path=REQUIREMENTS_PATH, folders=None):
+    """
+    Reads the requirements manifest.
+
+    Args:
+    path (str): The manifest, a JSON object of folder name to a list of pip packages.
+    folders (list): Only include these folders, or None for all of them.
+
+    Returns:
+    list: The pip packages needed on this platform, without duplicates.
+    """
+    with open(path, "r") as manifest_file:
+        manifest = json.load(manifest_file)
+    packages = []
+    for folder, folder_packages in manifest.items():
+        if folders is not None and folder not in folders:
+            continue
+        for package in folder_packages:
+            if package not in packages and (sys.platform == "win32" or package not in WINDOWS_ONLY):
+                packages.append(package)
+    return packages
+
+
+def is_installed(package):
+    # Looking up the installed distribution is instant compared to starting pip, and checking the
+    # import name as well catches variants like opencv-python-headless standing in for opencv-python
+    try:
+        importlib.metadata.distribution(package)
+        return True
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    import_name = IMPORT_NAMES.get(package, package.replace("-", "_"))
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def missing_packages(packages):
+    return [package for package in packages if not is_installed(package)]
+
+
+def install_packages(packages, on_output=print):
+    """
+    Installs whichever of the packages are missing with a single pip run, so pip and its
+    dependency resolver only start once.
+
+    Args:
+    packages (list): The pip packages that are needed.
+    on_output (callable): Called with each line pip prints, to show progress.
+
+    Returns:
+    list: The packages that were installed.
+    """
+    missing = missing_packages(packages)
+    if not missing:
+        on_output("All packages are already installed.")
+        return []
+
+    on_output(f"Installing {', '.join(missing)}...")
+    command = [sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check', *missing]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as process:
+        for line in process.stdout:
+            on_output(line.rstrip())
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    importlib.invalidate_caches()
+    return missing
@@ -0,0 +1,113 @@
+# Serves stand-in wheels for every package in requirements.json from a local package index and
+# compares the old one-pip-per-package install with the in-process check and single batched pip
+# run, in a throwaway virtual environment. Takes a minute or so, most of it creating the venv.
+# Usage: python PackageInstallerBenchmark.py
+import base64
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from PackageInstaller import IMPORT_NAMES, load_requirements
+
+UPDATER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LEGACY_INSTALL = '''
+import subprocess, sys
+for package in sys.argv[1:]:
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'show', package], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package], stdout=subprocess.DEVNULL)
+'''
+
+BATCHED_INSTALL = f'''
+import sys
+sys.path.insert(0, {UPDATER_DIR!r})
+from PackageInstaller import install_packages
+install_packages(sys.argv[1:], on_output=lambda line: None)
+'''
+
+
+def build_wheel(wheel_dir, package, version="99.0"):
+    # A minimal pure Python wheel that installs an empty module under the package's import name
+    dist_name = re.sub(r"[-_.]+", "_", package)
+    import_name = IMPORT_NAMES.get(package, package.replace("-", "_"))
+    dist_info = f"{dist_name}-{version}.dist-info"
+    files = {
+        f"{import_name}/__init__.py": b"",
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {package}\nVersion: {version}\n".encode(),
+        f"{dist_info}/WHEEL": b"Wheel-Version: 1.0\nGenerator: benchmark\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = []
+    for path, content in files.items():
+        digest = base64.urlsafe_b64encode(hashlib.sha256(content).digest()).rstrip(b"=").decode()
+        record.append(f"{path},sha256={digest},{len(content)}")
+    record.append(f"{dist_info}/RECORD,,")
+    files[f"{dist_info}/RECORD"] = ("\n".join(record) + "\n").encode()
+
+    wheel_name = f"{dist_name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(os.path.join(wheel_dir, wheel_name), "w") as wheel:
+        for path, content in files.items():
+            wheel.writestr(path, content)
+    return wheel_name
+
+
+def build_index(index_dir, packages):
+    wheel_dir = os.path.join(index_dir, "wheels")
+    os.makedirs(wheel_dir)
+    for package in packages:
+        wheel_name = build_wheel(wheel_dir, package)
+        project_dir = os.path.join(index_dir, "simple", re.sub(r"[-_.]+", "-", package).lower())
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, "index.html"), "w") as page:
+            page.write(f'<html><body><a href="../../wheels/{wheel_name}">{wheel_name}</a></body></html>\n')
+
+
+def start_index(index_dir):
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=index_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/simple"
+
+
+def timed_run(python, script, packages, env):
+    start = time.perf_counter()
+    subprocess.run([python, "-c", script, *packages], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    packages = load_requirements()
+    with tempfile.TemporaryDirectory() as work_dir:
+        build_index(os.path.join(work_dir, "index"), packages)
+        server, index_url = start_index(os.path.join(work_dir, "index"))
+
+        venv_dir = os.path.join(work_dir, "venv")
+        print("Creating a throwaway virtual environment...")
+        subprocess.run([sys.executable, "-m", "venv", venv_dir], check=True)
+        python = os.path.join(venv_dir, "Scripts" if os.name == "nt" else "bin", "python")
+        env = dict(os.environ, PIP_INDEX_URL=index_url, PIP_DISABLE_PIP_VERSION_CHECK="1", PIP_NO_CACHE_DIR="1")
+
+        print(f"{len(packages)} packages: {', '.join(packages)}")
+        print(f"  {'':<28} {'all missing':>12} {'all installed':>14}")
+        for name, script in (("one pip per package", LEGACY_INSTALL), ("checked in-process, 1 pip", BATCHED_INSTALL)):
+            missing = timed_run(python, script, packages, env)
+            installed = timed_run(python, script, packages, env)
+            print(f"  {name:<28} {missing:10.2f} s {installed:12.2f} s")
+            subprocess.run([python, "-m", "pip", "uninstall", "-y", "-q", *packages], env=env, check=True)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
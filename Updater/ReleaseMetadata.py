@@ -0,0 +1,96 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+RELEASE_API_URL = "https://api.github.com/repos/Stari-Div/Python-Utilities/releases/latest"
+
+# Shared by the UI and the updater so neither has to ask GitHub again while the answer is fresh
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".python_utilities", "release_cache.json")
+CACHE_TTL = 600  # seconds
+REQUEST_TIMEOUT = 10  # seconds
+
+
+def load_cache(cache_path=CACHE_PATH):
+    try:
+        with open(cache_path, "r") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, cache_path=CACHE_PATH):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write to a temporary file first so a crash or a second copy of the app can't leave half a file behind
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not save the release cache: {e}")
+
+
+def get_release_info(url=RELEASE_API_URL, cache_path=CACHE_PATH, ttl=CACHE_TTL, timeout=REQUEST_TIMEOUT):
+    """
+    Gets the release information from the GitHub API, using the on-disk cache where it can.
+
+    A cached answer younger than ttl is used without touching the network. An older one is
+    revalidated with If-None-Match, and GitHub answers 304 Not Modified without counting it
+    against the rate limit when nothing changed. If the request fails or times out the last
+    known answer is used instead.
+
+    Args:
+    url (str): The API URL to fetch.
+    cache_path (str): The cache file.
+    ttl (float): How many seconds a cached answer is used without checking with GitHub.
+    timeout (float): How many seconds to wait for GitHub before giving up.
+
+    Returns:
+    dict: The release information, or None if it couldn't be fetched and nothing was cached.
+    """
+    cache = load_cache(cache_path)
+    entry = cache.get(url)
+    if entry and time.time() - entry["fetched_at"] < ttl:
+        return entry["data"]
+
+    headers = {"Accept": "application/vnd.github+json", "User-Agent": "Python-Utilities"}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    try:
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = json.loads(response.read().decode())
+            etag = response.headers.get("ETag")
+        cache[url] = {"etag": etag, "fetched_at": time.time(), "data": data}
+        save_cache(cache, cache_path)
+        return data
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry:
+            # Not modified, the cached answer is good for another ttl
+            entry["fetched_at"] = time.time()
+            save_cache(cache, cache_path)
+            return entry["data"]
+        print(f"HTTP error occurred: {e.code} - {e.reason}")
+    except urllib.error.URLError as e:
+        print(f"URL error occurred: {e.reason}")
+    except (OSError, ValueError) as e:
+        print(f"An error occurred: {e}")
+
+    if entry:
+        print("Using the last known release information")
+        return entry["data"]
+    return None
+
+
+def get_latest_release_tag(url=RELEASE_API_URL, cache_path=CACHE_PATH, ttl=CACHE_TTL, timeout=REQUEST_TIMEOUT):
+    """
+    Gets the tag name of the latest release, see get_release_info.
+
+    Returns:
+    str: The tag name, or None if it couldn't be found.
+    """
+    release_info = get_release_info(url, cache_path, ttl, timeout)
+    return release_info.get("tag_name") if release_info else None
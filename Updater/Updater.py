@@ -1,48 +1,171 @@
+import hashlib
+import http.client
 import os
+import time
 import urllib.request
-import json
+import zipfile
+
+from ReleaseMetadata import RELEASE_API_URL, REQUEST_TIMEOUT, get_release_info
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_RETRIES = 5
+PROGRESS_INTERVAL = 1.0  # seconds
 
 def get_latest_release_info(repo):
-    api_url = f"https://api.github.com/repos/Stari-Div/Python-Utilities/releases/latest" # Remove the brackets
+    api_url = RELEASE_API_URL
     print(f"Fetching URL: {api_url}")  # Debugging statement
+    # Cached on disk and shared with the UI, with a timeout and the last known release as a fallback
+    return get_release_info(api_url)
+
+def file_sha256(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def is_complete_zip(file_path):
+    # A truncated zip is missing its central directory, and testzip checks every member's CRC
     try:
-        with urllib.request.urlopen(api_url) as response:
-            if response.status == 200:
-                release_info = json.loads(response.read().decode())
-                return release_info
-            else:
-                print(f"Failed to fetch release info: HTTP {response.status}")
-    except urllib.error.HTTPError as e:
-        print(f"HTTP error occurred: {e.code} - {e.reason}")
-        try:
-            error_response = e.read().decode()
-            print(f"Error details: {error_response}")
-        except:
-            pass
-    except urllib.error.URLError as e:
-        print(f"URL error occurred: {e.reason}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-    return None
-
-def download_file(download_url, download_dir, file_name):
+        with zipfile.ZipFile(file_path) as zip_ref:
+            return zip_ref.testzip() is None
+    except (zipfile.BadZipFile, OSError, EOFError):
+        return False
+
+def _download_attempt(download_url, part_path, timeout):
+    # Carries on from the end of whatever was already downloaded. Returns (bytes received, total size)
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"User-Agent": "Python-Utilities"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    request = urllib.request.Request(download_url, headers=headers)
     try:
-        # Ensure the download directory exists
-        os.makedirs(download_dir, exist_ok=True)
-        
-        # Download the file
-        file_path = os.path.join(download_dir, file_name)
-        print(f"Downloading {file_name}...")
-        with urllib.request.urlopen(download_url) as response, open(file_path, "wb") as file:
-            file.write(response.read())
-        print(f"Downloaded {file_name} to {file_path}")
-    
+        response = urllib.request.urlopen(request, timeout=timeout)
     except urllib.error.HTTPError as e:
-        print(f"HTTP error occurred: {e.code} - {e.reason}")
-    except urllib.error.URLError as e:
-        print(f"URL error occurred: {e.reason}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+        if e.code == 416 and offset:
+            # Nothing left after the offset, so the previous attempt had already got the whole file
+            return 0, offset
+        raise
+
+    with response:
+        if response.status == 206:
+            mode = "ab"
+            total = int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[1]) or None
+        else:
+            # The server ignored the range, so start again from the beginning
+            offset = 0
+            mode = "wb"
+            length = response.headers.get("Content-Length")
+            total = int(length) if length else None
+
+        received = 0
+        start = last_report = time.perf_counter()
+        with open(part_path, mode) as file:
+            while chunk := response.read(CHUNK_SIZE):
+                file.write(chunk)
+                received += len(chunk)
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    done = f"{(offset + received) / 1e6:.1f}" + (f"/{total / 1e6:.1f}" if total else "")
+                    print(f"  {done} MB ({received / 1e6 / (now - start):.1f} MB/s)", end="\r")
+    return received, total
+
+def release_download(release_info, asset_name=None):
+    """
+    Picks what to download from a release. By default that's the source zipball, which is what the
+    UI expects and has no published checksum. Naming an asset downloads that asset instead, checked
+    against the SHA-256 GitHub publishes as its digest.
+
+    Args:
+    release_info (dict): The release information from the GitHub API.
+    asset_name (str): The file name of a release asset to download instead of the zipball, or None.
+
+    Returns:
+    tuple: The download URL and the expected SHA-256 as hex, or None if there isn't one.
+    """
+    if asset_name is None:
+        return release_info["zipball_url"], None
+    for asset in release_info.get("assets", []):
+        if asset.get("name") == asset_name:
+            digest = asset.get("digest") or ""
+            return asset["browser_download_url"], digest[len("sha256:"):] if digest.startswith("sha256:") else None
+    raise ValueError(f"The release has no asset named {asset_name}")
+
+def download_file(download_url, download_dir, file_name, sha256=None, retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT):
+    """
+    Streams a file to disk in chunks instead of holding it all in memory. It goes to a .part file
+    first, interrupted downloads carry on where they stopped using HTTP Range requests, and the
+    file is only renamed into place once it's complete and, if a checksum is given, verified.
+
+    When the server doesn't say how big the file is, as with GitHub's chunked zipballs, the end of
+    the stream proves nothing. The download then only counts as complete when it matches sha256,
+    or without one, when it is a zip that passes testzip. Anything else is resumed or retried.
+
+    Args:
+    download_url (str): The file to download.
+    download_dir (str): The folder to save it in.
+    file_name (str): The name to save it as.
+    sha256 (str): The expected SHA-256 of the file as hex, or None to skip the check.
+    retries (int): How many times to carry on after the connection drops.
+    timeout (float): How many seconds to wait for the server before treating the connection as dropped.
+
+    Returns:
+    str: The path of the downloaded file, or None if it failed.
+    """
+    # Ensure the download directory exists
+    os.makedirs(download_dir, exist_ok=True)
+    file_path = os.path.join(download_dir, file_name)
+    part_path = file_path + ".part"
+    print(f"Downloading {file_name}...")
+
+    start = time.perf_counter()
+    verified = False
+    for attempt in range(retries + 1):
+        try:
+            _, total = _download_attempt(download_url, part_path, timeout)
+            if total is not None:
+                if os.path.getsize(part_path) >= total:
+                    break
+            elif sha256:
+                verified = file_sha256(part_path) == sha256.lower()
+                if verified:
+                    break
+            elif is_complete_zip(part_path):
+                verified = True
+                break
+            print(f"Connection dropped at {os.path.getsize(part_path) / 1e6:.1f} MB")
+        except urllib.error.HTTPError as e:
+            print(f"HTTP error occurred: {e.code} - {e.reason}")
+            # Only server errors are worth trying again
+            if e.code < 500:
+                return None
+        except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+            print(f"Download interrupted: {e}")
+        if attempt < retries:
+            # Back off a little more each time, up to 10 seconds
+            time.sleep(min(2 ** attempt * 0.5, 10))
+            print(f"Resuming ({attempt + 1}/{retries})...")
+    else:
+        print(f"Giving up on {file_name} after {retries} retries, run again to carry on from where it stopped")
+        return None
+
+    if sha256 and not verified and file_sha256(part_path) != sha256.lower():
+        print(f"{file_name} is corrupt (SHA-256 mismatch), deleting it")
+        os.remove(part_path)
+        return None
+    if not sha256 and not verified and file_name.lower().endswith(".zip") and not is_complete_zip(part_path):
+        print(f"{file_name} is corrupt (not a complete zip), deleting it")
+        os.remove(part_path)
+        return None
+
+    os.replace(part_path, file_path)
+    elapsed = time.perf_counter() - start
+    # Measured from the finished file, since bytes from attempts that had to start over were thrown away
+    size = os.path.getsize(file_path)
+    print(f"Downloaded {file_name} to {file_path} ({size / 1e6:.1f} MB in {elapsed:.1f} s, "
+          f"{size / 1e6 / elapsed if elapsed else 0:.1f} MB/s)")
+    return file_path
 
 if __name__ == "__main__":
     # GitHub repository in the format "owner/repo"
@@ -50,20 +173,23 @@ if __name__ == "__main__":
     
     # Directory to save the downloaded file
     download_dir = "./downloads" # Recommended to leave it as downloads
+
+    # Leave as None for the source zipball. Set to a release asset's file name to download that instead, checked against its SHA-256
+    asset_name = None
     
     # Get the latest release info
     release_info = get_latest_release_info(repo) # Boring API stuff
     
     if release_info:
         # Extract the download URL and tag name
-        download_url = release_info["zipball_url"]
+        download_url, sha256 = release_download(release_info, asset_name)
         tag_name = release_info["tag_name"]
         
         # Create the file name with the tag
         file_name = f"Python-Utilities-{tag_name}.zip" # This adds the update tag after the name of the repo for better identification
         
         # Download the file
-        download_file(download_url, download_dir, file_name)
+        download_file(download_url, download_dir, file_name, sha256)
     else:
         print("Failed to retrieve the download URL.")
     # Created by CursedGhoul :) 